@@ -1,7 +1,24 @@
 """Base configuration shared across all strategies"""
 
+import sys
+
+# Names re-exported by the strategy configs' `from config.base_config import *`
+__all__ = [
+    "NIFTY50_SYMBOLS",
+    "NIFTY50_INDEX_KEY",
+    "UPSTOX_INSTRUMENTS_URL",
+    "FETCH_WORKERS",
+    "FETCH_RETRIES",
+    "INSTRUMENTS_CACHE_HOURS",
+    "FILTER_WORKERS",
+    "INDICATOR_WORKERS",
+    "RESULTS_DIR",
+    "CACHE_DIR",
+]
+
 # NIFTY50 constituent symbols (official NSE list - updated Dec 2025)
-NIFTY50_SYMBOLS = [
+# Immutable tuple of interned strings, built once at import
+NIFTY50_SYMBOLS = tuple(sys.intern(symbol) for symbol in (
     "ADANIENT", "ADANIPORTS", "APOLLOHOSP", "ASIANPAINT", "AXISBANK",
     "BAJAJ-AUTO", "BAJFINANCE", "BAJAJFINSV", "BEL", "BHARTIARTL",
     "CIPLA", "COALINDIA", "DRREDDY", "EICHERMOT", "GRASIM",
@@ -12,13 +29,21 @@ NIFTY50_SYMBOLS = [
     "RELIANCE", "SBILIFE", "SBIN", "SHRIRAMFIN", "SUNPHARMA",
     "TATASTEEL", "TATACONSUM", "TCS", "TECHM", "TITAN",
     "TMPV", "TRENT", "ULTRACEMCO", "WIPRO"
-]
+))
 
 # NIFTY50 Index instrument key for relative strength calculation
 NIFTY50_INDEX_KEY = "NSE_INDEX|Nifty 50"
 
 # Upstox API configuration
 UPSTOX_INSTRUMENTS_URL = "https://assets.upstox.com/market-quote/instruments/exchange/NSE.json.gz"
+FETCH_WORKERS = 10  # Concurrent per-symbol API requests (keep under Upstox rate limits)
+FETCH_RETRIES = 3  # Retries (with backoff) for 429/5xx responses and connection errors
+INSTRUMENTS_CACHE_HOURS = 6  # Reuse the downloaded symbol -> instrument key map for this long
+
+# Filtering configuration
+FILTER_WORKERS = 1  # Worker processes for per-symbol scalping filters (1 = serial, None = all cores)
+INDICATOR_WORKERS = 1  # Worker processes for per-symbol indicator calculation (1 = serial, None = all cores)
 
 # Output configuration
 RESULTS_DIR = "results"
+CACHE_DIR = "cache"  # Between-run state (safe to delete)
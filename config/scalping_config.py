@@ -1,5 +1,7 @@
 """Configuration for scalping strategy (intraday - minutes)"""
 
+from dataclasses import dataclass
+
 from config.base_config import *
 
 # Strategy metadata
@@ -10,43 +12,51 @@ TIMEFRAME = "intraday (5-15 minutes)"
 # Data fetching configuration
 HISTORICAL_DAYS = 100          # Need less historical data for scalping
 INTRADAY_INTERVAL = "5min"     # 5-min candles (9 candles by 10 AM)
-INTRADAY_LOOKBACK_CANDLES = 50  # Last 50 x 5-min candles (~4 hours)
 
 # Filter thresholds
-FILTER_THRESHOLDS = {
+@dataclass(frozen=True, slots=True)
+class ScalpingFilterThresholds:
+    """Scalping filter thresholds (immutable, read as attributes in the filter hot path)"""
+
     # Liquidity filters (critical for scalping)
-    "MIN_AVG_VOLUME": 2000000,         # Minimum 2M shares daily volume
-    "MAX_SPREAD_PERCENT": 0.15,        # Max 0.15% bid-ask spread
+    MIN_AVG_VOLUME: int = 2000000        # Minimum 2M shares daily volume
+    MAX_SPREAD_PERCENT: float = 0.15     # Max 0.15% bid-ask spread
 
     # Opening Range Breakout (ORB) settings
-    "ORB_START_TIME": "09:15",         # ORB period start
-    "ORB_END_TIME": "09:30",           # ORB period end (first 15 mins)
-    "ORB_BREAKOUT_MIN_PCT": 0.2,       # Must break ORB by 0.2%
+    ORB_START_TIME: str = "09:15"        # ORB period start
+    ORB_END_TIME: str = "09:30"          # ORB period end (first 15 mins)
+    ORB_BREAKOUT_MIN_PCT: float = 0.2    # Must break ORB by 0.2%
 
     # Fast EMA filters (work with 9+ candles)
-    "EMA_FAST": 5,                     # Fast EMA for trend
-    "EMA_SLOW": 9,                     # Slow EMA for confirmation
+    EMA_FAST: int = 5                    # Fast EMA for trend
+    EMA_SLOW: int = 9                    # Slow EMA for confirmation
 
     # RSI (relaxed - not primary filter)
-    "RSI_PERIOD": 7,                   # 7-period RSI (more stable than 3)
-    "RSI_NEUTRAL_MIN": 40,             # Accept neutral range
-    "RSI_NEUTRAL_MAX": 60,             # Not just extremes
+    RSI_PERIOD: int = 7                  # 7-period RSI (more stable than 3)
+    RSI_NEUTRAL_MIN: int = 40            # Accept neutral range
+    RSI_NEUTRAL_MAX: int = 60            # Not just extremes
 
     # VWAP filters (relaxed)
-    "VWAP_DEVIATION_MAX": 0.8,         # Max 0.8% from VWAP
+    VWAP_DEVIATION_MAX: float = 0.8      # Max 0.8% from VWAP
 
     # Volume filters (shorter average for responsiveness)
-    "MIN_VOLUME_SPIKE": 1.0,           # 1.0x volume (at or above average)
-    "VOLUME_AVG_PERIOD": 10,           # Use last 10 candles (not 20)
+    MIN_VOLUME_SPIKE: float = 1.0        # 1.0x volume (at or above average)
+    VOLUME_AVG_PERIOD: int = 10          # Use last 10 candles (not 20)
 
     # ATR (relaxed)
-    "MIN_ATR_POINTS": 1.5,             # Minimum movement potential
-}
+    MIN_ATR_POINTS: float = 1.5          # Minimum movement potential
+
+
+FILTER_THRESHOLDS = ScalpingFilterThresholds()
+
+# ORB breakout direction -> int code emitted by the filters as "orb_breakout_code"
+# (0 = no breakout), so the scorer can branch on small ints instead of strings
+ORB_BREAKOUT_CODES = {"up": 1, "down": -1}
 
 # Scoring weights (must sum to 100)
 SCORING_WEIGHTS = {
     "liquidity": 30,           # Critical for scalping - tight spreads, high volume
-    "momentum": 25,            # MACD + RSI strength
+    "momentum": 25,            # ORB breakout strength + volume spike
     "vwap_setup": 20,          # Proximity to VWAP for entries
     "trend_alignment": 15,     # EMA 9 vs 20 alignment
     "volatility": 10,          # ATR-based movement potential
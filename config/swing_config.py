@@ -1,5 +1,7 @@
 """Configuration for swing trading strategy (1-3 day holds)"""
 
+from dataclasses import dataclass
+
 from config.base_config import *
 
 # Strategy metadata
@@ -9,40 +11,43 @@ TIMEFRAME = "1-3 days"
 
 # Data fetching configuration
 HISTORICAL_DAYS = 400          # Number of calendar days to fetch (~250-280 trading days for EMA200)
-INTRADAY_START_TIME = "09:15"  # Market open time
-INTRADAY_END_TIME = "10:00"    # Cutoff for intraday confirmation
 INTRADAY_INTERVAL = "15min"    # 15-min candles for swing
 
 # Filter thresholds
-FILTER_THRESHOLDS = {
+@dataclass(frozen=True, slots=True)
+class SwingFilterThresholds:
+    """Swing filter thresholds (immutable, read as attributes in the filter hot path)"""
+
     # Daily timeframe filters
-    "ADX_MIN": 20,                    # Minimum ADX for trend strength (allows moderate trends)
-    "RSI_MIN": 35,                    # Minimum RSI (allows pullback entries)
-    "RSI_MAX": 70,                    # Maximum RSI (allows momentum plays)
-    "ATR_MULTIPLIER": 1.0,            # ATR must be >= 1.0x its 20-day average (at/above average)
-    "VOLUME_MULTIPLIER": 1.0,         # Current volume > 1x of 20-day average
-    "EMA_SLOPE_DAYS": 5,              # Days to check EMA20 slope
+    ADX_MIN: int = 20                    # Minimum ADX for trend strength (allows moderate trends)
+    RSI_MIN: int = 35                    # Minimum RSI (allows pullback entries)
+    RSI_MAX: int = 70                    # Maximum RSI (allows momentum plays)
+    ATR_MULTIPLIER: float = 1.0          # ATR must be >= 1.0x its 20-day average (at/above average)
+    VOLUME_MULTIPLIER: float = 1.0       # Current volume > 1x of 20-day average
+    EMA_SLOPE_DAYS: int = 5              # Days to check EMA20 slope
 
     # Price action filters
-    "MIN_HIGHER_LOWS": 2,             # Minimum consecutive higher lows required (relaxed to 2)
-    "CONSOLIDATION_RANGE": 0.03,      # Max 3% range for consolidation detection
-    "CONSOLIDATION_DAYS": 5,          # Minimum days in consolidation
-    "VOLUME_EXPANSION_DAYS": 3,       # Check last N days for volume expansion
+    MIN_HIGHER_LOWS: int = 2             # Minimum consecutive higher lows required (relaxed to 2)
+    CONSOLIDATION_RANGE: float = 0.03    # Max 3% range for consolidation detection
+    CONSOLIDATION_DAYS: int = 5          # Minimum days in consolidation
+    VOLUME_EXPANSION_DAYS: int = 3       # Check last N days for volume expansion
 
     # Support/Resistance filters
-    "MIN_DISTANCE_TO_RESISTANCE": 2.0,  # Minimum 2% distance to resistance
-    "MAX_DISTANCE_TO_SUPPORT": 5.0,     # Maximum 5% distance to support
+    MIN_DISTANCE_TO_RESISTANCE: float = 2.0  # Minimum 2% distance to resistance
+    MAX_DISTANCE_TO_SUPPORT: float = 5.0     # Maximum 5% distance to support
 
     # Trade quality filters
-    "MIN_STOP_DISTANCE": 0.5,         # Minimum 0.5% stop distance
-    "MAX_STOP_DISTANCE": 2.0,         # Maximum 2.0% stop distance
-    "MIN_RISK_REWARD": 1.5,           # Minimum 1.5R risk-reward ratio
+    MIN_STOP_DISTANCE: float = 0.5       # Minimum 0.5% stop distance
+    MAX_STOP_DISTANCE: float = 2.0       # Maximum 2.0% stop distance
+    MIN_RISK_REWARD: float = 1.5         # Minimum 1.5R risk-reward ratio
 
     # Intraday confirmation filters (15-min)
-    "INTRADAY_VOLUME_MULTIPLIER": 1.2,  # 15-min volume >= 1.2x 20-period avg
-    "UPPER_WICK_THRESHOLD": 0.5,        # Upper wick must be < 50% of candle range
-    "VWAP_CANDLES_TO_CHECK": 2,         # First N candles to check for VWAP hold
-}
+    INTRADAY_VOLUME_MULTIPLIER: float = 1.2  # 15-min volume >= 1.2x 20-period avg
+    UPPER_WICK_THRESHOLD: float = 0.5        # Upper wick must be < 50% of candle range
+    VWAP_CANDLES_TO_CHECK: int = 2           # First N candles to check for VWAP hold
+
+
+FILTER_THRESHOLDS = SwingFilterThresholds()
 
 # Scoring weights (must sum to 100)
 SCORING_WEIGHTS = {
@@ -58,3 +63,6 @@ SCORING_WEIGHTS = {
 
 # Output configuration
 MAX_STOCKS_TO_SELECT = 3      # Return top 1-3 stocks
+
+# Filter state persisted between runs (per-symbol weekly trend, under CACHE_DIR)
+FILTER_STATE_FILE = "swing_filter_state.pkl"
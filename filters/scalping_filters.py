@@ -1,9 +1,274 @@
 """Scalping filters based on Opening Range Breakout (ORB) strategy"""
 
+import math
+import os
+import numpy as np
 import pandas as pd
-from typing import Tuple, Dict
-from datetime import time
-from config.scalping_config import FILTER_THRESHOLDS
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple, Dict
+from config.scalping_config import FILTER_THRESHOLDS, FILTER_WORKERS, ORB_BREAKOUT_CODES
+from lib.indicators import calculate_average_volume_batch
+
+__all__ = ["ScalpingFilter"]
+
+
+# Columns read from the latest candle, in the order of _latest_values()
+_SCALPING_COLUMNS = [
+    "open", "high", "low", "close", "volume", "vwap", "vwap_deviation_pct",
+    "ema_5", "ema_9", "atr", "rsi_7", "volume_avg_10",
+]
+(
+    _OPEN, _HIGH, _LOW, _CLOSE, _VOLUME, _VWAP, _VWAP_DEVIATION_PCT,
+    _EMA_5, _EMA_9, _ATR, _RSI_7, _VOLUME_AVG_10,
+) = range(len(_SCALPING_COLUMNS))
+
+# Opening range bounds as offsets from the session's midnight
+_ORB_START = pd.Timedelta(hours=9, minutes=15)
+_ORB_END = pd.Timedelta(hours=9, minutes=30)
+
+
+def _orb_window(df: pd.DataFrame) -> slice:
+    """
+    Get the row slice of the latest session's 9:15-9:30 opening range
+
+    Positions come from a binary search on the sorted index. Only the latest
+    session is searched: the intraday endpoint returns today's candles alone,
+    and on a multi-day frame a range spanning several mornings would not be
+    an opening range at all.
+
+    Args:
+        df: Intraday DataFrame sorted by timestamp
+
+    Returns:
+        Slice of row positions inside the opening range (9:30 excluded)
+    """
+    session = df.index[-1].normalize()
+    start = df.index.searchsorted(session + _ORB_START, side="left")
+    end = df.index.searchsorted(session + _ORB_END, side="left")
+
+    return slice(start, end)
+
+
+def _latest_values(df: pd.DataFrame) -> np.ndarray:
+    """
+    Get the latest candle's scalping columns as one float array
+
+    Read positionally in one go, so filter_stock builds it once and every
+    check indexes the same small array instead of building its own row Series.
+
+    Args:
+        df: Intraday DataFrame with scalping indicators
+
+    Returns:
+        Array indexed by the _OPEN.._VOLUME_AVG_10 constants (NaN for missing columns)
+    """
+    return df.iloc[-1:].reindex(columns=_SCALPING_COLUMNS).to_numpy(dtype=float)[0]
+
+
+def _check_orb_breakout(latest: np.ndarray, orb_high: float, orb_low: float) -> Tuple[bool, Dict]:
+    """
+    Check that the latest close has broken out of the opening range
+
+    Args:
+        latest: Latest candle values from _latest_values()
+        orb_high: Opening range high (None if unavailable)
+        orb_low: Opening range low (None if unavailable)
+
+    Returns:
+        Tuple of (passed: bool, results: dict)
+    """
+    if orb_high is None or orb_low is None:
+        return False, {"reason": "ORB range not available"}
+
+    current_price = latest[_CLOSE]
+    results = {"orb_high": orb_high, "orb_low": orb_low, "current_price": current_price}
+
+    # Check for breakout (must be at least 0.2% beyond ORB)
+    breakout_threshold = FILTER_THRESHOLDS.ORB_BREAKOUT_MIN_PCT / 100
+
+    if current_price > orb_high * (1 + breakout_threshold):
+        results["orb_breakout"] = "up"
+    elif current_price < orb_low * (1 - breakout_threshold):
+        results["orb_breakout"] = "down"
+    else:
+        return False, {"reason": f"No ORB breakout (price: {current_price:.2f}, ORB: {orb_low:.2f}-{orb_high:.2f})"}
+
+    results["orb_breakout_code"] = ORB_BREAKOUT_CODES[results["orb_breakout"]]
+
+    results["passed"] = True
+    return True, results
+
+
+def _check_ema_alignment(latest: np.ndarray, orb_direction: str) -> Tuple[bool, Dict]:
+    """
+    Check that EMA5 vs EMA9 agrees with the breakout direction
+
+    Args:
+        latest: Latest candle values from _latest_values()
+        orb_direction: "up" or "down"
+
+    Returns:
+        Tuple of (passed: bool, results: dict)
+    """
+    ema_5 = latest[_EMA_5]
+    ema_9 = latest[_EMA_9]
+
+    if math.isnan(ema_5) or math.isnan(ema_9):
+        return False, {"reason": "EMA not available"}
+
+    # Bullish breakout: EMA5 should be > EMA9
+    if orb_direction == "up" and ema_5 <= ema_9:
+        return False, {"reason": f"EMA not aligned for bullish (5:{ema_5:.2f} <= 9:{ema_9:.2f})"}
+
+    # Bearish breakout: EMA5 should be < EMA9
+    if orb_direction == "down" and ema_5 >= ema_9:
+        return False, {"reason": f"EMA not aligned for bearish (5:{ema_5:.2f} >= 9:{ema_9:.2f})"}
+
+    return True, {"ema_5": ema_5, "ema_9": ema_9, "ema_aligned": True, "passed": True}
+
+
+def _check_volume_spike(latest: np.ndarray) -> Tuple[bool, Dict]:
+    """
+    Check the latest volume against its 10-candle average
+
+    Args:
+        latest: Latest candle values from _latest_values()
+
+    Returns:
+        Tuple of (passed: bool, results: dict)
+    """
+    volume_avg = latest[_VOLUME_AVG_10]
+
+    if math.isnan(volume_avg) or volume_avg == 0:
+        return False, {"reason": "Volume average not available"}
+
+    volume_ratio = latest[_VOLUME] / volume_avg
+
+    if volume_ratio < FILTER_THRESHOLDS.MIN_VOLUME_SPIKE:
+        return False, {"reason": f"No volume spike ({volume_ratio:.1f}x < {FILTER_THRESHOLDS.MIN_VOLUME_SPIKE}x)"}
+
+    return True, {"volume_spike": volume_ratio, "passed": True}
+
+
+def _check_vwap_atr(latest: np.ndarray) -> Tuple[bool, Dict]:
+    """
+    Check VWAP proximity and ATR of the latest candle
+
+    Args:
+        latest: Latest candle values from _latest_values()
+
+    Returns:
+        Tuple of (passed: bool, results: dict)
+    """
+    # VWAP deviation
+    vwap = latest[_VWAP]
+
+    if math.isnan(vwap):
+        return False, {"reason": "VWAP not available"}
+
+    # Precomputed by add_scalping_indicators; derived here for frames without it
+    vwap_deviation_pct = latest[_VWAP_DEVIATION_PCT]
+    if math.isnan(vwap_deviation_pct):
+        vwap_deviation_pct = abs((latest[_CLOSE] - vwap) / vwap) * 100
+
+    if vwap_deviation_pct > FILTER_THRESHOLDS.VWAP_DEVIATION_MAX:
+        return False, {"reason": f"Too far from VWAP ({vwap_deviation_pct:.2f}%)"}
+
+    results = {"vwap": vwap, "vwap_deviation_pct": vwap_deviation_pct}
+
+    # ATR check
+    atr = latest[_ATR]
+
+    if math.isnan(atr):
+        return False, {"reason": "ATR not available"}
+
+    if atr < FILTER_THRESHOLDS.MIN_ATR_POINTS:
+        return False, {"reason": f"Low ATR ({atr:.2f} < {FILTER_THRESHOLDS.MIN_ATR_POINTS})"}
+
+    results["atr"] = atr
+
+    # RSI (optional - just store, don't filter)
+    rsi = latest[_RSI_7]
+    if not math.isnan(rsi):
+        results["rsi_7"] = rsi
+
+    results["passed"] = True
+    return True, results
+
+
+def _filter_last_row(
+    latest: np.ndarray, orb_high: float, orb_low: float, results: Dict
+) -> Optional[Tuple[str, Dict]]:
+    """
+    Run the ORB, EMA, volume and VWAP/ATR checks on one latest-candle array
+
+    Passing checks write their results into `results` as they go.
+
+    Args:
+        latest: Latest candle values from _latest_values()
+        orb_high: Opening range high (None if unavailable)
+        orb_low: Opening range low (None if unavailable)
+        results: Results dict to extend
+
+    Returns:
+        None if every check passed, else (failed stage, failure results)
+    """
+    passed, stage_results = _check_orb_breakout(latest, orb_high, orb_low)
+    if not passed:
+        return "orb", stage_results
+    results.update(stage_results)
+
+    passed, stage_results = _check_ema_alignment(latest, stage_results["orb_breakout"])
+    if not passed:
+        return "ema", stage_results
+    results.update(stage_results)
+
+    passed, stage_results = _check_volume_spike(latest)
+    if not passed:
+        return "volume", stage_results
+    results.update(stage_results)
+
+    passed, stage_results = _check_vwap_atr(latest)
+    if not passed:
+        return "vwap_atr", stage_results
+    results.update(stage_results)
+
+    return None
+
+
+def _average_daily_volumes(stock_data: Dict[str, Dict[str, pd.DataFrame]], days: int = 20) -> Dict[str, float]:
+    """
+    Get the liquidity filter's average daily volume for many stocks in one reduction
+
+    Stocks with fewer than `days` daily bars are left out and fall back to
+    the per-stock average in apply_liquidity_filters.
+
+    Args:
+        stock_data: Dict mapping symbol to {"daily": df, "intraday": df}
+        days: Number of most recent daily bars to average
+
+    Returns:
+        Dict mapping symbol to average daily volume
+    """
+    symbols = [symbol for symbol, data in stock_data.items() if len(data["daily"]) >= days]
+    if not symbols:
+        return {}
+
+    volume = np.stack([stock_data[symbol]["daily"]["volume"].to_numpy(dtype=float)[-days:] for symbol in symbols])
+    return dict(zip(symbols, calculate_average_volume_batch(volume, period=days)))
+
+
+def _filter_one(job: Tuple[str, pd.DataFrame, pd.DataFrame, Optional[float]]) -> Tuple[bool, Dict]:
+    """
+    Run the scalping filters for one stock (module-level so worker processes can unpickle it)
+
+    Args:
+        job: Tuple of (symbol, daily_df, intraday_df, avg_volume)
+
+    Returns:
+        Tuple of (passed: bool, results: dict)
+    """
+    return ScalpingFilter().filter_stock(*job)
 
 
 class ScalpingFilter:
@@ -19,14 +284,12 @@ class ScalpingFilter:
         Returns:
             Tuple of (orb_high, orb_low)
         """
-        # Filter candles between 9:15 and 9:30
-        orb_start = time(9, 15)
-        orb_end = time(9, 30)
+        if intraday_df.empty:
+            return None, None
 
-        orb_candles = intraday_df[
-            (intraday_df.index.time >= orb_start) &
-            (intraday_df.index.time < orb_end)
-        ]
+        # Candles between 9:15 and 9:30 of the latest session
+        window = _orb_window(intraday_df)
+        orb_candles = intraday_df.iloc[window]
 
         if orb_candles.empty:
             return None, None
@@ -37,7 +300,12 @@ class ScalpingFilter:
         return orb_high, orb_low
 
     def apply_liquidity_filters(
-        self, symbol: str, daily_df: pd.DataFrame, intraday_df: pd.DataFrame
+        self,
+        symbol: str,
+        daily_df: pd.DataFrame,
+        intraday_df: pd.DataFrame,
+        avg_volume: Optional[float] = None,
+        latest: Optional[np.ndarray] = None,
     ) -> Tuple[bool, Dict]:
         """
         Check liquidity (volume + spreads)
@@ -46,6 +314,8 @@ class ScalpingFilter:
             symbol: Stock symbol
             daily_df: Daily DataFrame
             intraday_df: 5-min intraday DataFrame
+            avg_volume: Optional precomputed 20-day average volume (see filter_all)
+            latest: Optional precomputed latest candle values (see filter_stock)
 
         Returns:
             Tuple of (passed: bool, results: dict)
@@ -53,17 +323,19 @@ class ScalpingFilter:
         results = {"symbol": symbol}
 
         # Daily average volume check
-        avg_volume = daily_df["volume"].tail(20).mean()
-        if avg_volume < FILTER_THRESHOLDS["MIN_AVG_VOLUME"]:
+        if avg_volume is None:
+            avg_volume = daily_df["volume"].tail(20).mean()
+        if avg_volume < FILTER_THRESHOLDS.MIN_AVG_VOLUME:
             return False, {"reason": f"Low volume ({avg_volume/1e6:.1f}M)"}
 
         results["avg_volume"] = avg_volume
 
         # Spread check (using latest 5-min candle)
-        latest = intraday_df.iloc[-1]
-        spread_pct = ((latest["high"] - latest["low"]) / latest["close"]) * 100
+        if latest is None:
+            latest = _latest_values(intraday_df)
+        spread_pct = ((latest[_HIGH] - latest[_LOW]) / latest[_CLOSE]) * 100
 
-        if spread_pct > FILTER_THRESHOLDS["MAX_SPREAD_PERCENT"]:
+        if spread_pct > FILTER_THRESHOLDS.MAX_SPREAD_PERCENT:
             return False, {"reason": f"Wide spread ({spread_pct:.2f}%)"}
 
         results["spread_pct"] = spread_pct
@@ -86,37 +358,8 @@ class ScalpingFilter:
         if intraday_df.empty or len(intraday_df) < 3:
             return False, {"reason": "Insufficient data for ORB"}
 
-        results = {}
-
-        # Calculate ORB range
         orb_high, orb_low = self.calculate_orb(intraday_df)
-
-        if orb_high is None or orb_low is None:
-            return False, {"reason": "ORB range not available"}
-
-        results["orb_high"] = orb_high
-        results["orb_low"] = orb_low
-
-        # Current price
-        latest = intraday_df.iloc[-1]
-        current_price = latest["close"]
-        results["current_price"] = current_price
-
-        # Check for breakout (must be at least 0.2% beyond ORB)
-        breakout_threshold = FILTER_THRESHOLDS["ORB_BREAKOUT_MIN_PCT"] / 100
-
-        breakout_up = current_price > orb_high * (1 + breakout_threshold)
-        breakout_down = current_price < orb_low * (1 - breakout_threshold)
-
-        if breakout_up:
-            results["orb_breakout"] = "up"
-        elif breakout_down:
-            results["orb_breakout"] = "down"
-        else:
-            return False, {"reason": f"No ORB breakout (price: {current_price:.2f}, ORB: {orb_low:.2f}-{orb_high:.2f})"}
-
-        results["passed"] = True
-        return True, results
+        return _check_orb_breakout(_latest_values(intraday_df), orb_high, orb_low)
 
     def apply_ema_filters(
         self, intraday_df: pd.DataFrame, orb_direction: str
@@ -131,29 +374,7 @@ class ScalpingFilter:
         Returns:
             Tuple of (passed: bool, results: dict)
         """
-        results = {}
-        latest = intraday_df.iloc[-1]
-
-        ema_5 = latest.get("ema_5")
-        ema_9 = latest.get("ema_9")
-
-        if pd.isna(ema_5) or pd.isna(ema_9):
-            return False, {"reason": "EMA not available"}
-
-        results["ema_5"] = ema_5
-        results["ema_9"] = ema_9
-
-        # Bullish breakout: EMA5 should be > EMA9
-        if orb_direction == "up" and ema_5 <= ema_9:
-            return False, {"reason": f"EMA not aligned for bullish (5:{ema_5:.2f} <= 9:{ema_9:.2f})"}
-
-        # Bearish breakout: EMA5 should be < EMA9
-        if orb_direction == "down" and ema_5 >= ema_9:
-            return False, {"reason": f"EMA not aligned for bearish (5:{ema_5:.2f} >= 9:{ema_9:.2f})"}
-
-        results["ema_aligned"] = True
-        results["passed"] = True
-        return True, results
+        return _check_ema_alignment(_latest_values(intraday_df), orb_direction)
 
     def apply_volume_filters(
         self, intraday_df: pd.DataFrame
@@ -167,24 +388,7 @@ class ScalpingFilter:
         Returns:
             Tuple of (passed: bool, results: dict)
         """
-        results = {}
-        latest = intraday_df.iloc[-1]
-
-        # Volume average from indicator (10-period)
-        volume_avg = latest.get("volume_avg_10")
-        current_volume = latest["volume"]
-
-        if pd.isna(volume_avg) or volume_avg == 0:
-            return False, {"reason": "Volume average not available"}
-
-        volume_ratio = current_volume / volume_avg
-
-        if volume_ratio < FILTER_THRESHOLDS["MIN_VOLUME_SPIKE"]:
-            return False, {"reason": f"No volume spike ({volume_ratio:.1f}x < {FILTER_THRESHOLDS['MIN_VOLUME_SPIKE']}x)"}
-
-        results["volume_spike"] = volume_ratio
-        results["passed"] = True
-        return True, results
+        return _check_volume_spike(_latest_values(intraday_df))
 
     def apply_vwap_atr_filters(
         self, intraday_df: pd.DataFrame
@@ -198,45 +402,10 @@ class ScalpingFilter:
         Returns:
             Tuple of (passed: bool, results: dict)
         """
-        results = {}
-        latest = intraday_df.iloc[-1]
-
-        # VWAP deviation
-        vwap = latest.get("vwap")
-        close = latest["close"]
-
-        if pd.isna(vwap):
-            return False, {"reason": "VWAP not available"}
-
-        vwap_deviation_pct = abs((close - vwap) / vwap) * 100
-
-        if vwap_deviation_pct > FILTER_THRESHOLDS["VWAP_DEVIATION_MAX"]:
-            return False, {"reason": f"Too far from VWAP ({vwap_deviation_pct:.2f}%)"}
-
-        results["vwap"] = vwap
-        results["vwap_deviation_pct"] = vwap_deviation_pct
-
-        # ATR check
-        atr = latest.get("atr")
-
-        if pd.isna(atr):
-            return False, {"reason": "ATR not available"}
-
-        if atr < FILTER_THRESHOLDS["MIN_ATR_POINTS"]:
-            return False, {"reason": f"Low ATR ({atr:.2f} < {FILTER_THRESHOLDS['MIN_ATR_POINTS']})"}
-
-        results["atr"] = atr
-
-        # RSI (optional - just store, don't filter)
-        rsi = latest.get("rsi_7")
-        if not pd.isna(rsi):
-            results["rsi_7"] = rsi
-
-        results["passed"] = True
-        return True, results
+        return _check_vwap_atr(_latest_values(intraday_df))
 
     def filter_stock(
-        self, symbol: str, daily_df: pd.DataFrame, intraday_df: pd.DataFrame
+        self, symbol: str, daily_df: pd.DataFrame, intraday_df: pd.DataFrame, avg_volume: Optional[float] = None
     ) -> Tuple[bool, Dict]:
         """
         Apply all ORB scalping filters
@@ -245,6 +414,7 @@ class ScalpingFilter:
             symbol: Stock symbol
             daily_df: Daily DataFrame
             intraday_df: 5-min intraday DataFrame
+            avg_volume: Optional precomputed 20-day average volume (see filter_all)
 
         Returns:
             Tuple of (passed: bool, results: dict)
@@ -253,44 +423,56 @@ class ScalpingFilter:
         if intraday_df.empty or len(intraday_df) < 5:
             return False, {"stage": "data", "reason": "Insufficient intraday data"}
 
-        # Filter 1: Liquidity
-        liquidity_passed, liquidity_results = self.apply_liquidity_filters(
-            symbol, daily_df, intraday_df
+        # Latest candle, read once for every check below
+        latest = _latest_values(intraday_df)
+
+        # Filter 1: Liquidity (its results seed the dict every later stage writes into)
+        liquidity_passed, results = self.apply_liquidity_filters(
+            symbol, daily_df, intraday_df, avg_volume, latest
         )
         if not liquidity_passed:
-            return False, {"stage": "liquidity", **liquidity_results}
+            return False, {"stage": "liquidity", **results}
+
+        # Filters 2-5: ORB breakout, EMA, volume, VWAP + ATR on the latest candle
+        orb_high, orb_low = self.calculate_orb(intraday_df)
+        failure = _filter_last_row(latest, orb_high, orb_low, results)
+        if failure is not None:
+            stage, failure_results = failure
+            return False, {"stage": stage, **results, **failure_results}
+
+        # All filters passed
+        return True, results
 
-        # Filter 2: ORB Breakout (PRIMARY)
-        orb_passed, orb_results = self.apply_orb_filters(intraday_df)
-        if not orb_passed:
-            return False, {"stage": "orb", **liquidity_results, **orb_results}
+    def filter_all(
+        self, stock_data: Dict[str, Dict[str, pd.DataFrame]], workers: Optional[int] = FILTER_WORKERS
+    ) -> Dict[str, Tuple[bool, Dict]]:
+        """
+        Apply all ORB scalping filters to many stocks
+
+        Stocks are independent, so with more than one worker they are split
+        into one chunk per process. Serial by default: for ~50 stocks the
+        process start-up and DataFrame pickling usually outweigh the gain.
 
-        orb_direction = orb_results["orb_breakout"]
+        Args:
+            stock_data: Dict mapping symbol to {"daily": df, "intraday": df}
+            workers: Worker processes (1 = serial, None = all cores)
 
-        # Filter 3: EMA Alignment
-        ema_passed, ema_results = self.apply_ema_filters(intraday_df, orb_direction)
-        if not ema_passed:
-            return False, {"stage": "ema", **liquidity_results, **orb_results, **ema_results}
+        Returns:
+            Dict mapping symbol to (passed: bool, results: dict), in input order
+        """
+        # Liquidity averages for all stocks at once
+        avg_volumes = _average_daily_volumes(stock_data)
 
-        # Filter 4: Volume Spike
-        volume_passed, volume_results = self.apply_volume_filters(intraday_df)
-        if not volume_passed:
-            return False, {"stage": "volume", **liquidity_results, **orb_results, **ema_results, **volume_results}
+        jobs = [
+            (symbol, data["daily"], data["intraday"], avg_volumes.get(symbol))
+            for symbol, data in stock_data.items()
+        ]
+        workers = min(workers or os.cpu_count() or 1, len(jobs))
 
-        # Filter 5: VWAP + ATR
-        vwap_atr_passed, vwap_atr_results = self.apply_vwap_atr_filters(intraday_df)
-        if not vwap_atr_passed:
-            return False, {"stage": "vwap_atr", **liquidity_results, **orb_results, **ema_results, **volume_results, **vwap_atr_results}
+        if workers <= 1:
+            outcomes = [self.filter_stock(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                outcomes = list(pool.map(_filter_one, jobs, chunksize=math.ceil(len(jobs) / workers)))
 
-        # All filters passed
-        combined = {
-            "symbol": symbol,
-            "passed": True,
-            **liquidity_results,
-            **orb_results,
-            **ema_results,
-            **volume_results,
-            **vwap_atr_results,
-        }
-
-        return True, combined
+        return {job[0]: outcome for job, outcome in zip(jobs, outcomes)}
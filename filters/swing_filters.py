@@ -1,22 +1,255 @@
 """Stock filtering module with daily and intraday filters"""
 
+import math
+import os
+import pickle
+from collections import namedtuple
+from enum import IntEnum
+import numpy as np
 import pandas as pd
-from typing import Dict, Tuple
-from datetime import time
+from typing import Callable, Dict, List, Optional, Tuple
 
-from config.swing_config import FILTER_THRESHOLDS, INTRADAY_START_TIME, INTRADAY_END_TIME
+from config.swing_config import CACHE_DIR, FILTER_STATE_FILE, FILTER_THRESHOLDS
 from lib.indicators import (
-    calculate_ema_slope,
-    calculate_volume_ratio,
-    calculate_atr_ratio,
-    calculate_relative_strength,
-    check_higher_lows,
-    detect_consolidation,
-    check_volume_expansion,
-    detect_bullish_engulfing,
+    calculate_daily_metrics_batch,
+    calculate_period_return,
+    count_higher_lows_batch,
+    is_consolidating_batch,
+    is_volume_expanding,
+    is_bullish_engulfing,
 )
 from lib.market_analysis import MarketAnalyzer
 
+# Daily columns read by the daily filters, in unpacking order
+_DAILY_COLUMNS = ["open", "high", "low", "close", "ema_20", "ema_50", "ema_200", "adx", "rsi", "atr", "volume"]
+
+# Latest-bar daily columns that must be present; NaN elsewhere (e.g. volume)
+# is left to the checks that read that column
+_REQUIRED_COLUMNS = ["close", "ema_20", "ema_50", "ema_200", "adx", "rsi"]
+
+# Structure-of-arrays view of many stocks' recent daily bars: one contiguous
+# (stocks x bars) array per column, rows in `symbols` order
+DailyPanel = namedtuple("DailyPanel", ["symbols", *_DAILY_COLUMNS])
+
+# Intraday columns read by the confirmation-window filters, in unpacking order
+_INTRADAY_COLUMNS = ["open", "high", "low", "close", "vwap", "volume", "volume_avg_20"]
+
+
+# Confirmation window bounds as offsets from the session's midnight
+_WINDOW_START = pd.Timedelta(hours=9, minutes=30)
+_WINDOW_END = pd.Timedelta(hours=10)
+
+
+def _confirmation_window(df: pd.DataFrame) -> slice:
+    """
+    Get the row slice of the latest session's 9:30-10:00 confirmation window
+
+    Positions come from a binary search on the sorted index. Only the latest
+    session is searched; the intraday endpoint returns today's candles alone.
+
+    Args:
+        df: Intraday DataFrame sorted by timestamp
+
+    Returns:
+        Slice of row positions inside the window
+    """
+    session = df.index[-1].normalize()
+    start = df.index.searchsorted(session + _WINDOW_START, side="left")
+    end = df.index.searchsorted(session + _WINDOW_END, side="right")
+
+    return slice(start, end)
+
+
+def _opening_candles_failure(candles: np.ndarray, wick_threshold: float) -> Optional[str]:
+    """
+    Check the opening confirmation candles for VWAP hold and large upper wicks
+
+    Both checks run as array ops over the same block; the VWAP hold failure
+    takes precedence, as it did when they were separate filters.
+
+    Args:
+        candles: Rows of the window block (columns in _INTRADAY_COLUMNS order)
+        wick_threshold: Maximum upper wick as a fraction of the candle range
+
+    Returns:
+        Reason for the first failing check, or None if both pass
+    """
+    open_, high, low, close, vwap = candles[:, :5].T
+
+    # Filter 7: First two 15-min candles hold above VWAP
+    below_vwap = np.isnan(vwap) | (low < vwap)
+    i = below_vwap.argmax()
+    if below_vwap[i]:
+        return f"Candle {i + 1} dropped below VWAP"
+
+    # Filter 8: No large upper wick (>50% of candle range), flat candles skipped
+    candle_range = high - low
+    upper_wick = high - np.maximum(open_, close)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        wick_ratio = np.where(candle_range != 0, upper_wick / candle_range, 0.0)
+
+    large_wick = wick_ratio > wick_threshold
+    i = large_wick.argmax()
+    if large_wick[i]:
+        return f"Candle {i + 1} has large upper wick ({wick_ratio[i]:.1%})"
+
+    return None
+
+
+# Latest weekly trend per symbol: symbol -> ((week timestamp, close), result)
+_weekly_trend_cache: Dict[str, Tuple[tuple, Dict]] = {}
+
+
+def _weekly_trend(symbol: str, weekly_df: pd.DataFrame) -> Dict:
+    """
+    Get the weekly trend for a symbol, reusing the last result while the weekly bar is unchanged
+
+    The in-progress week's candle keeps moving until the week closes, so the key
+    includes the latest close as well as the bar's timestamp. A new bar or price
+    replaces the symbol's entry, which keeps the cache at one entry per symbol.
+
+    Args:
+        symbol: Stock symbol
+        weekly_df: Weekly OHLCV DataFrame with indicators
+
+    Returns:
+        Dict with weekly trend analysis (see MarketAnalyzer.check_weekly_trend)
+    """
+    key = (weekly_df.index[-1].value, weekly_df["close"].iat[-1])
+    cached = _weekly_trend_cache.get(symbol)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    weekly_trend = MarketAnalyzer.check_weekly_trend(weekly_df)
+    _weekly_trend_cache[symbol] = (key, weekly_trend)
+    return weekly_trend
+
+
+def build_daily_panel(daily_data: Dict[str, pd.DataFrame], symbols: List[str], bars: int) -> DailyPanel:
+    """
+    Stack the last `bars` daily rows of each stock into a DailyPanel
+
+    Only each stock's last `bars` rows are read, with a single positional
+    to_numpy(), then the block is transposed once so every column array is
+    contiguous. Every column stays float64: the indicators are compared
+    against thresholds, where a float32 rounding could flip pass/fail.
+
+    Args:
+        daily_data: Dict mapping symbol to DataFrame with daily OHLCV and indicators
+        symbols: Symbols to include, each with at least `bars` rows
+        bars: Number of most recent bars to keep
+
+    Returns:
+        DailyPanel with one (stocks x bars) array per column
+    """
+    block = np.stack([daily_data[s].iloc[-bars:][_DAILY_COLUMNS].to_numpy(dtype=float) for s in symbols])
+    columns = np.ascontiguousarray(block.transpose(2, 0, 1))
+    return DailyPanel(list(symbols), *columns)
+
+
+class RejectReason(IntEnum):
+    """Daily filter reason codes, numbered in the order the checks run (0 = passed)"""
+
+    PASSED = 0
+    INCOMPLETE_DATA = 1
+    ADX_LOW = 2
+    RSI_OUT_OF_RANGE = 3
+    EMA_MISALIGNED = 4
+    BELOW_200EMA = 5
+    NOT_BULLISH_REGIME = 6
+    EMA20_SLOPE_NOT_POSITIVE = 7
+    ATR_RATIO_LOW = 8
+    VOLUME_BELOW_AVERAGE = 9
+    NOT_OUTPERFORMING = 10
+    FEW_HIGHER_LOWS = 11
+
+    def describe(self, thresholds=FILTER_THRESHOLDS) -> Optional[str]:
+        """
+        Render the human-readable rejection reason
+
+        Args:
+            thresholds: Swing filter thresholds the reason quotes
+
+        Returns:
+            Reason string, or None for PASSED
+        """
+        template = _REJECT_REASON_TEMPLATES[self]
+        return None if template is None else template.format(t=thresholds)
+
+
+_REJECT_REASON_TEMPLATES = {
+    RejectReason.PASSED: None,
+    RejectReason.INCOMPLETE_DATA: "NaN in required indicators",
+    RejectReason.ADX_LOW: "ADX < {t.ADX_MIN}",
+    RejectReason.RSI_OUT_OF_RANGE: "RSI not in range {t.RSI_MIN}-{t.RSI_MAX}",
+    RejectReason.EMA_MISALIGNED: "EMA alignment failed (Close > EMA20 > EMA50)",
+    RejectReason.BELOW_200EMA: "Price not above 200 EMA",
+    RejectReason.NOT_BULLISH_REGIME: "Not in bullish regime (50 EMA <= 200 EMA)",
+    RejectReason.EMA20_SLOPE_NOT_POSITIVE: "EMA20 slope not positive",
+    RejectReason.ATR_RATIO_LOW: "ATR ratio < {t.ATR_MULTIPLIER}x",
+    RejectReason.VOLUME_BELOW_AVERAGE: "Volume below 20-day average",
+    RejectReason.NOT_OUTPERFORMING: "Not outperforming NIFTY50",
+    RejectReason.FEW_HIGHER_LOWS: "Less than {t.MIN_HIGHER_LOWS} consecutive higher lows",
+}
+
+
+def _specialize_daily_checks(thresholds) -> Tuple[Callable[..., List[np.ndarray]], Tuple[str, ...]]:
+    """
+    Build the cheap daily checks with thresholds bound once
+
+    The thresholds are frozen for a run, so they are read into closure
+    variables and the reason strings are formatted up front instead of on
+    every batch. The masks stay plain numpy: with one element per stock
+    (~50) each comparison is a single short pass, so a numexpr-style fused
+    kernel would not pay back its dispatch cost, and np.select needs each
+    filter's mask separately to pick the rejection reason anyway.
+
+    Args:
+        thresholds: Swing filter thresholds (FILTER_THRESHOLDS)
+
+    Returns:
+        Tuple of (checks, reasons). checks takes a mask of stocks whose latest
+        bar has no NaN, the latest close, EMA20/50/200, ADX and RSI plus the
+        EMA20 slope, ATR ratio, volume ratio and RS arrays, and returns one pass
+        mask per cheap filter, in RejectReason order. reasons holds the
+        rendered reason of every RejectReason after PASSED.
+    """
+    adx_min = thresholds.ADX_MIN
+    rsi_min = thresholds.RSI_MIN
+    rsi_max = thresholds.RSI_MAX
+    atr_multiplier = thresholds.ATR_MULTIPLIER
+    volume_multiplier = thresholds.VOLUME_MULTIPLIER
+
+    # Rendered once per run; the batch only gathers them by reason code
+    reasons = tuple(reason.describe(thresholds) for reason in RejectReason if reason)
+
+    def checks(complete, close, ema_20, ema_50, ema_200, adx, rsi, ema20_slope, atr_ratio, volume_ratio, rs):
+        # Ordered so the filters that reject the most stocks come first
+        return [
+            # Latest bar has every required value (NaN/inf rejected up front)
+            complete,
+            # Filter 5: ADX > 25
+            adx >= adx_min,
+            # Filter 6: RSI between 40 and 65
+            (rsi >= rsi_min) & (rsi <= rsi_max),
+            # Filter 2: Close > EMA20 > EMA50
+            (close > ema_20) & (ema_20 > ema_50),
+            # Filter 1: Price > 200 EMA
+            close > ema_200,
+            # Filter 3: 50 EMA > 200 EMA (bullish regime)
+            ema_50 > ema_200,
+            # Filter 4: EMA20 slope positive (last 5 days)
+            ~(ema20_slope <= 0),
+            # Filter 7: ATR >= 1.5x its 20-day average
+            ~(atr_ratio < atr_multiplier),
+            # Filter 8: Current volume > 20-day average
+            ~(volume_ratio < volume_multiplier),
+            # Filter 9: Relative Strength vs NIFTY50 > 0
+            ~(rs <= 0),
+        ]
+
+    return checks, reasons
+
 
 class StockFilter:
     """Handles all filtering logic for stock selection"""
@@ -30,6 +263,20 @@ class StockFilter:
         """
         self.nifty_index_df = nifty_index_df
 
+        # The index's 20-day return is shared by every stock's RS check, so compute it once
+        self.nifty_return = (
+            calculate_period_return(nifty_index_df["close"].to_numpy(), period=20)
+            if len(nifty_index_df) >= 20
+            else None
+        )
+
+        # Daily checks specialized to the current thresholds
+        self._cheap_daily_checks, daily_reasons = _specialize_daily_checks(FILTER_THRESHOLDS)
+        # Indexed by reason code (0 = passed)
+        self._daily_reason_table = np.array([None, *daily_reasons], dtype=object)
+        # Running count of stocks per reason code, for reviewing the check order
+        self._daily_reason_counts = np.zeros(len(self._daily_reason_table), dtype=np.int64)
+
     def apply_daily_filters(
         self, symbol: str, df: pd.DataFrame
     ) -> Tuple[bool, Dict[str, any]]:
@@ -43,97 +290,116 @@ class StockFilter:
         Returns:
             Tuple of (passed: bool, filter_results: dict)
         """
-        if df.empty or len(df) < 200:
-            return False, {"reason": "Insufficient data"}
+        return self.apply_daily_filters_batch({symbol: df})[symbol]
 
-        results = {}
-        latest = df.iloc[-1]
-
-        # Filter 1: Price > 200 EMA
-        if pd.isna(latest["ema_200"]) or latest["close"] <= latest["ema_200"]:
-            return False, {"reason": "Price not above 200 EMA"}
-        results["above_200ema"] = True
-
-        # Filter 2: Close > EMA20 > EMA50
-        if (
-            pd.isna(latest["ema_20"])
-            or pd.isna(latest["ema_50"])
-            or latest["close"] <= latest["ema_20"]
-            or latest["ema_20"] <= latest["ema_50"]
-        ):
-            return False, {"reason": "EMA alignment failed (Close > EMA20 > EMA50)"}
-        results["ema_alignment"] = True
-
-        # Filter 3: 50 EMA > 200 EMA (bullish regime)
-        if pd.isna(latest["ema_200"]) or latest["ema_50"] <= latest["ema_200"]:
-            return False, {"reason": "Not in bullish regime (50 EMA <= 200 EMA)"}
-        results["bullish_regime"] = True
-
-        # Filter 4: EMA20 slope positive (last 5 days)
-        ema20_slope = calculate_ema_slope(df["ema_20"], FILTER_THRESHOLDS["EMA_SLOPE_DAYS"])
-        if ema20_slope <= 0:
-            return False, {"reason": "EMA20 slope not positive"}
-        results["ema20_slope"] = ema20_slope
-
-        # Filter 5: ADX > 25
-        if pd.isna(latest["adx"]) or latest["adx"] < FILTER_THRESHOLDS["ADX_MIN"]:
-            return False, {"reason": f"ADX < {FILTER_THRESHOLDS['ADX_MIN']}"}
-        results["adx"] = latest["adx"]
-
-        # Filter 6: RSI between 40 and 65
-        if (
-            pd.isna(latest["rsi"])
-            or latest["rsi"] < FILTER_THRESHOLDS["RSI_MIN"]
-            or latest["rsi"] > FILTER_THRESHOLDS["RSI_MAX"]
-        ):
-            return False, {
-                "reason": f"RSI not in range {FILTER_THRESHOLDS['RSI_MIN']}-{FILTER_THRESHOLDS['RSI_MAX']}"
-            }
-        results["rsi"] = latest["rsi"]
-
-        # Filter 7: ATR >= 1.5x its 20-day average
-        atr_ratio = calculate_atr_ratio(df["atr"], period=20)
-        if atr_ratio < FILTER_THRESHOLDS["ATR_MULTIPLIER"]:
-            return False, {"reason": f"ATR ratio < {FILTER_THRESHOLDS['ATR_MULTIPLIER']}x"}
-        results["atr_ratio"] = atr_ratio
-
-        # Filter 8: Current volume > 20-day average
-        volume_ratio = calculate_volume_ratio(df, period=20)
-        if volume_ratio < FILTER_THRESHOLDS["VOLUME_MULTIPLIER"]:
-            return False, {"reason": "Volume below 20-day average"}
-        results["volume_ratio"] = volume_ratio
-
-        # Filter 9: Relative Strength vs NIFTY50 > 0
-        rs = calculate_relative_strength(df, self.nifty_index_df, period=20)
-        if rs <= 0:
-            return False, {"reason": "Not outperforming NIFTY50"}
-        results["relative_strength"] = rs
+    def apply_daily_filters_batch(
+        self, daily_data: Dict[str, pd.DataFrame]
+    ) -> Dict[str, Tuple[bool, Dict[str, any]]]:
+        """
+        Apply all daily timeframe filters to many stocks in one vectorized pass
 
-        # Filter 10: Higher lows pattern (minimum 3 consecutive)
-        higher_lows = check_higher_lows(df, lookback=FILTER_THRESHOLDS["MIN_HIGHER_LOWS"] + 1)
-        if higher_lows < FILTER_THRESHOLDS["MIN_HIGHER_LOWS"]:
-            return False, {"reason": f"Less than {FILTER_THRESHOLDS['MIN_HIGHER_LOWS']} consecutive higher lows"}
-        results["higher_lows_count"] = higher_lows
+        The recent bars of every stock are stacked into (stocks x bars) arrays so
+        each filter is a single NumPy comparison across all stocks.
+
+        Args:
+            daily_data: Dict mapping symbol to DataFrame with daily OHLCV and indicators
+
+        Returns:
+            Dict mapping symbol to (passed: bool, filter_results: dict)
+        """
+        # Pre-seeding the keys keeps outcomes in input order
+        outcomes = dict.fromkeys(daily_data)
+        symbols = []
+        for symbol, df in daily_data.items():
+            if df.empty or len(df) < 200:
+                outcomes[symbol] = (False, {"reason": "Insufficient data"})
+            else:
+                symbols.append(symbol)
+
+        if not symbols:
+            return outcomes
+
+        # Recent history needed by the windowed filters (20-day averages + today)
+        higher_lows_lookback = FILTER_THRESHOLDS.MIN_HIGHER_LOWS + 1
+        consolidation_days = FILTER_THRESHOLDS.CONSOLIDATION_DAYS
+        expansion_days = FILTER_THRESHOLDS.VOLUME_EXPANSION_DAYS
+        tail = max(
+            21, FILTER_THRESHOLDS.EMA_SLOPE_DAYS, higher_lows_lookback, consolidation_days + 1, expansion_days
+        )
+
+        panel = build_daily_panel(daily_data, symbols, bars=tail)
+
+        ema20_slope, atr_ratio, volume_ratio, rs = calculate_daily_metrics_batch(
+            panel.close, panel.ema_20, panel.atr, panel.volume, self.nifty_return,
+            slope_days=FILTER_THRESHOLDS.EMA_SLOPE_DAYS, period=20,
+        )
 
-        # Filter 11: Volume expansion pattern (last 3 days) - OPTIONAL BONUS
-        volume_expanding = check_volume_expansion(df, days=FILTER_THRESHOLDS["VOLUME_EXPANSION_DAYS"])
-        results["volume_expanding"] = volume_expanding  # Bonus points in scoring, not required
+        # One finiteness scan over the latest bar of the compared price/indicator columns
+        latest = np.column_stack([getattr(panel, column)[:, -1] for column in _REQUIRED_COLUMNS])
+        complete = np.isfinite(latest).all(axis=1)
+
+        # Cheap array comparisons on the latest bar, in rejection-rate order
+        masks = self._cheap_daily_checks(
+            complete, panel.close[:, -1], panel.ema_20[:, -1], panel.ema_50[:, -1], panel.ema_200[:, -1],
+            panel.adx[:, -1], panel.rsi[:, -1], ema20_slope, atr_ratio, volume_ratio, rs,
+        )
+
+        # Filter 10: Higher lows pattern (minimum 3 consecutive)
+        higher_lows = count_higher_lows_batch(panel.low[:, -higher_lows_lookback:])
+        masks.append(higher_lows >= FILTER_THRESHOLDS.MIN_HIGHER_LOWS)
 
         # Filter 12: Check if breaking out of consolidation (optional bonus)
-        in_consolidation = detect_consolidation(
-            df.iloc[:-1],  # Check previous days, not today
-            days=FILTER_THRESHOLDS["CONSOLIDATION_DAYS"],
-            max_range_pct=FILTER_THRESHOLDS["CONSOLIDATION_RANGE"]
+        # Check previous days, not today
+        consolidating = is_consolidating_batch(
+            panel.high[:, -consolidation_days - 1 : -1],
+            panel.low[:, -consolidation_days - 1 : -1],
+            max_range_pct=FILTER_THRESHOLDS.CONSOLIDATION_RANGE,
         )
-        results["breakout_from_consolidation"] = in_consolidation
 
-        # Filter 13: Bullish price action pattern (optional bonus)
-        bullish_pattern = detect_bullish_engulfing(df)
-        results["bullish_pattern"] = bullish_pattern
+        # RejectReason code per stock: 0 = passed, otherwise 1 + index of the first failed check
+        reason_codes = np.select(
+            [~mask for mask in masks], np.arange(1, len(masks) + 1, dtype=np.uint8), default=0
+        ).astype(np.uint8)
 
-        # All filters passed
-        results["passed"] = True
-        return True, results
+        self._daily_reason_counts += np.bincount(reason_codes, minlength=len(self._daily_reason_counts))
+
+        # Reason column for all stocks in one gather (None where passed)
+        reasons = self._daily_reason_table[reason_codes]
+
+        for i, symbol in enumerate(symbols):
+            if reason_codes[i]:
+                outcomes[symbol] = (False, {"reason": reasons[i]})
+                continue
+
+            results = {
+                "above_200ema": True,
+                "ema_alignment": True,
+                "bullish_regime": True,
+                "ema20_slope": float(ema20_slope[i]),
+                "adx": float(panel.adx[i, -1]),
+                "rsi": float(panel.rsi[i, -1]),
+                "atr_ratio": float(atr_ratio[i]),
+                "volume_ratio": float(volume_ratio[i]),
+                "relative_strength": float(rs[i]),
+                "higher_lows_count": int(higher_lows[i]),
+            }
+
+            # Filter 11: Volume expansion pattern (last 3 days) - OPTIONAL BONUS
+            results["volume_expanding"] = is_volume_expanding(
+                panel.volume[i, -expansion_days:]
+            )  # Bonus points in scoring, not required
+
+            # Filter 12: Breaking out of consolidation (optional bonus)
+            results["breakout_from_consolidation"] = consolidating[i]
+
+            # Filter 13: Bullish price action pattern (optional bonus)
+            results["bullish_pattern"] = is_bullish_engulfing(panel.open[i], panel.close[i])
+
+            # All filters passed
+            results["passed"] = True
+            outcomes[symbol] = (True, results)
+
+        return outcomes
 
     def apply_intraday_filters(self, df: pd.DataFrame) -> Tuple[bool, Dict[str, any]]:
         """
@@ -150,59 +416,36 @@ class StockFilter:
 
         results = {}
 
-        # Filter intraday data to 9:30-10:00 window
-        # Convert time strings to time objects for comparison
-        start_time = time(9, 30)
-        end_time = time(10, 0)
+        # Filter intraday data to the 9:30-10:00 window (cached row slice), read as one float block
+        window = df.iloc[_confirmation_window(df)][_INTRADAY_COLUMNS].to_numpy(dtype=float)
 
-        # Filter candles in the window
-        mask = (df.index.time >= start_time) & (df.index.time <= end_time)
-        window_df = df[mask]
-
-        if len(window_df) < FILTER_THRESHOLDS["VWAP_CANDLES_TO_CHECK"]:
+        if len(window) < FILTER_THRESHOLDS.VWAP_CANDLES_TO_CHECK:
             return False, {"reason": "Insufficient intraday candles in 9:30-10:00 window"}
 
-        # Get first N candles for checks
-        first_candles = window_df.head(FILTER_THRESHOLDS["VWAP_CANDLES_TO_CHECK"])
+        _, _, _, latest_price, latest_vwap, latest_volume, avg_volume = window[-1]
 
         # Filter 6: Price above VWAP
-        latest_price = window_df["close"].iloc[-1]
-        latest_vwap = window_df["vwap"].iloc[-1]
-
-        if pd.isna(latest_vwap) or latest_price <= latest_vwap:
+        if math.isnan(latest_vwap) or latest_price <= latest_vwap:
             return False, {"reason": "Price not above VWAP"}
         results["above_vwap"] = True
 
-        # Filter 7: First two 15-min candles hold above VWAP
-        for i, (idx, candle) in enumerate(first_candles.iterrows()):
-            if pd.isna(candle["vwap"]) or candle["low"] < candle["vwap"]:
-                return False, {"reason": f"Candle {i+1} dropped below VWAP"}
+        # Filters 7-8: First N candles hold VWAP and have no large upper wicks
+        failure = _opening_candles_failure(
+            window[: FILTER_THRESHOLDS.VWAP_CANDLES_TO_CHECK], FILTER_THRESHOLDS.UPPER_WICK_THRESHOLD
+        )
+        if failure:
+            return False, {"reason": failure}
         results["vwap_hold"] = True
-
-        # Filter 8: No large upper wick (>50% of candle range)
-        for i, (idx, candle) in enumerate(first_candles.iterrows()):
-            candle_range = candle["high"] - candle["low"]
-            if candle_range == 0:
-                continue
-
-            upper_wick = candle["high"] - max(candle["open"], candle["close"])
-            wick_ratio = upper_wick / candle_range
-
-            if wick_ratio > FILTER_THRESHOLDS["UPPER_WICK_THRESHOLD"]:
-                return False, {"reason": f"Candle {i+1} has large upper wick ({wick_ratio:.1%})"}
         results["no_large_wicks"] = True
 
         # Filter 9: 15-min volume >= 1.2x 20-period average
         # Check latest candle's volume
-        latest_volume = window_df["volume"].iloc[-1]
-        avg_volume = window_df["volume_avg_20"].iloc[-1]
-
-        if pd.isna(avg_volume) or avg_volume == 0:
+        if math.isnan(avg_volume) or avg_volume == 0:
             # If no volume average, skip this check
             results["volume_confirmed"] = True
-        elif latest_volume < FILTER_THRESHOLDS["INTRADAY_VOLUME_MULTIPLIER"] * avg_volume:
+        elif latest_volume < FILTER_THRESHOLDS.INTRADAY_VOLUME_MULTIPLIER * avg_volume:
             return False, {
-                "reason": f"15-min volume < {FILTER_THRESHOLDS['INTRADAY_VOLUME_MULTIPLIER']}x average"
+                "reason": f"15-min volume < {FILTER_THRESHOLDS.INTRADAY_VOLUME_MULTIPLIER}x average"
             }
         else:
             results["volume_confirmed"] = True
@@ -227,15 +470,123 @@ class StockFilter:
         Returns:
             Tuple of (passed: bool, combined_results: dict)
         """
-        # Apply daily filters first
-        daily_passed, daily_results = self.apply_daily_filters(symbol, daily_df)
+        stock_data = {symbol: {"daily": daily_df, "intraday": intraday_df, "weekly": weekly_df}}
+        return self.filter_all(stock_data)[symbol]
+
+    @staticmethod
+    def save_state(path: str = os.path.join(CACHE_DIR, FILTER_STATE_FILE)) -> None:
+        """
+        Persist the per-symbol weekly trend cache for the next run (best effort)
+
+        Entries stay keyed on their weekly bar, so a rescreen later in the week
+        reuses only the trends whose bar has not moved.
+
+        Args:
+            path: Pickle file to write
+        """
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump({"weekly_trend": _weekly_trend_cache}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def load_state(path: str = os.path.join(CACHE_DIR, FILTER_STATE_FILE)) -> bool:
+        """
+        Seed the per-symbol weekly trend cache from a previous run
+
+        Args:
+            path: Pickle file written by save_state()
+
+        Returns:
+            True if state was loaded, False if the file is missing or unreadable
+        """
+        try:
+            with open(path, "rb") as f:
+                state = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return False
+        except (AttributeError, ImportError, IndexError, TypeError, ValueError):
+            # Pickled by an incompatible version of the code or its libraries
+            return False
+
+        weekly_trend = state.get("weekly_trend") if isinstance(state, dict) else None
+        if not isinstance(weekly_trend, dict):
+            return False
+
+        _weekly_trend_cache.update(weekly_trend)
+        return True
+
+    def daily_rejection_counts(self) -> Dict[str, int]:
+        """
+        Get how many stocks each daily check has rejected so far
+
+        The cheap checks are ordered by how often they reject; these counts
+        show whether that order still matches the data.
+
+        Returns:
+            Dict mapping rejection reason to count, most frequent first
+        """
+        counts = {
+            reason: int(count)
+            for reason, count in zip(self._daily_reason_table[1:], self._daily_reason_counts[1:])
+            if count
+        }
+        return dict(sorted(counts.items(), key=lambda item: item[1], reverse=True))
+
+    def filter_all(
+        self, stock_data: Dict[str, Dict[str, pd.DataFrame]]
+    ) -> Dict[str, Tuple[bool, Dict[str, any]]]:
+        """
+        Apply daily, weekly and intraday filters to many stocks
+
+        Daily filters run as one vectorized batch; the weekly and intraday
+        checks only run for the few stocks that survive them.
+
+        Args:
+            stock_data: Dict mapping symbol to {"daily": df, "intraday": df, "weekly": df (optional)}
+
+        Returns:
+            Dict mapping symbol to (passed: bool, combined_results: dict), in input order
+        """
+        daily_outcomes = self.apply_daily_filters_batch(
+            {symbol: data["daily"] for symbol, data in stock_data.items()}
+        )
+
+        outcomes = {}
+        for symbol, data in stock_data.items():
+            daily_passed, daily_results = daily_outcomes[symbol]
+
+            if not daily_passed:
+                outcomes[symbol] = (False, {"stage": "daily", **daily_results})
+            else:
+                outcomes[symbol] = self._confirm_daily_pass(
+                    symbol, daily_results, data["intraday"], data.get("weekly")
+                )
+
+        return outcomes
+
+    def _confirm_daily_pass(
+        self, symbol: str, daily_results: Dict, intraday_df: pd.DataFrame, weekly_df: pd.DataFrame = None
+    ) -> Tuple[bool, Dict[str, any]]:
+        """
+        Apply the weekly and intraday filters to a stock that passed the daily filters
 
-        if not daily_passed:
-            return False, {"stage": "daily", **daily_results}
+        Args:
+            symbol: Stock symbol
+            daily_results: Results dict from the daily filters
+            intraday_df: DataFrame with 15-min intraday data and indicators
+            weekly_df: Optional weekly DataFrame for higher timeframe validation
 
+        Returns:
+            Tuple of (passed: bool, combined_results: dict)
+        """
         # Filter 14: Weekly timeframe alignment (optional but highly recommended)
         if weekly_df is not None and not weekly_df.empty:
-            weekly_trend = MarketAnalyzer.check_weekly_trend(weekly_df)
+            weekly_trend = _weekly_trend(symbol, weekly_df)
             daily_results["weekly_trend"] = weekly_trend["weekly_trend"]
             daily_results["weekly_suitable"] = weekly_trend.get("suitable_for_swing", False)
 
@@ -252,15 +603,11 @@ class StockFilter:
         if not intraday_passed:
             return False, {"stage": "intraday", **daily_results, **intraday_results}
 
-        # Both passed - combine results
-        combined = {
-            "symbol": symbol,
-            "passed": True,
-            **daily_results,
-            **intraday_results,
-        }
+        # Both passed - extend the daily results in place
+        daily_results["symbol"] = symbol
+        daily_results.update(intraday_results)
 
-        return True, combined
+        return True, daily_results
 
     @staticmethod
     def validate_trade_quality(
@@ -290,11 +637,11 @@ class StockFilter:
             stop_distance_pct = abs((current_price - stop_loss) / current_price) * 100
             metrics["stop_distance_pct"] = stop_distance_pct
 
-            if stop_distance_pct < FILTER_THRESHOLDS["MIN_STOP_DISTANCE"]:
-                return False, {"reason": f"Stop too tight ({stop_distance_pct:.2f}% < {FILTER_THRESHOLDS['MIN_STOP_DISTANCE']}%)"}
+            if stop_distance_pct < FILTER_THRESHOLDS.MIN_STOP_DISTANCE:
+                return False, {"reason": f"Stop too tight ({stop_distance_pct:.2f}% < {FILTER_THRESHOLDS.MIN_STOP_DISTANCE}%)"}
 
-            if stop_distance_pct > FILTER_THRESHOLDS["MAX_STOP_DISTANCE"]:
-                return False, {"reason": f"Stop too wide ({stop_distance_pct:.2f}% > {FILTER_THRESHOLDS['MAX_STOP_DISTANCE']}%)"}
+            if stop_distance_pct > FILTER_THRESHOLDS.MAX_STOP_DISTANCE:
+                return False, {"reason": f"Stop too wide ({stop_distance_pct:.2f}% > {FILTER_THRESHOLDS.MAX_STOP_DISTANCE}%)"}
 
         # Check risk-reward ratio (using EMA9 entry)
         risk_ema9 = trade_setup.get("risk_ema9", 0)
@@ -305,8 +652,8 @@ class StockFilter:
             rr_ratio = (target_ema9 - ema9) / risk_ema9
             metrics["risk_reward"] = rr_ratio
 
-            if rr_ratio < FILTER_THRESHOLDS["MIN_RISK_REWARD"]:
-                return False, {"reason": f"R:R too low ({rr_ratio:.2f}R < {FILTER_THRESHOLDS['MIN_RISK_REWARD']}R)"}
+            if rr_ratio < FILTER_THRESHOLDS.MIN_RISK_REWARD:
+                return False, {"reason": f"R:R too low ({rr_ratio:.2f}R < {FILTER_THRESHOLDS.MIN_RISK_REWARD}R)"}
 
         # Check distance to resistance
         sr_levels = stock_analysis.get("sr_levels", {})
@@ -314,16 +661,16 @@ class StockFilter:
             res_distance = sr_levels["resistance_distance_pct"]
             metrics["resistance_distance_pct"] = res_distance
 
-            if res_distance < FILTER_THRESHOLDS["MIN_DISTANCE_TO_RESISTANCE"]:
-                return False, {"reason": f"Too close to resistance ({res_distance:.1f}% < {FILTER_THRESHOLDS['MIN_DISTANCE_TO_RESISTANCE']}%)"}
+            if res_distance < FILTER_THRESHOLDS.MIN_DISTANCE_TO_RESISTANCE:
+                return False, {"reason": f"Too close to resistance ({res_distance:.1f}% < {FILTER_THRESHOLDS.MIN_DISTANCE_TO_RESISTANCE}%)"}
 
         # Check distance to support (should not be too far)
         if "support_distance_pct" in sr_levels:
             sup_distance = sr_levels["support_distance_pct"]
             metrics["support_distance_pct"] = sup_distance
 
-            if sup_distance > FILTER_THRESHOLDS["MAX_DISTANCE_TO_SUPPORT"]:
-                return False, {"reason": f"Too far from support ({sup_distance:.1f}% > {FILTER_THRESHOLDS['MAX_DISTANCE_TO_SUPPORT']}%)"}
+            if sup_distance > FILTER_THRESHOLDS.MAX_DISTANCE_TO_SUPPORT:
+                return False, {"reason": f"Too far from support ({sup_distance:.1f}% > {FILTER_THRESHOLDS.MAX_DISTANCE_TO_SUPPORT}%)"}
 
         metrics["passed"] = True
         return True, metrics
@@ -3,23 +3,86 @@
 import os
 import gzip
 import json
+import pickle
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import upstox_client
 from dotenv import load_dotenv
+import numpy as np
 import pandas as pd
 
 from config.base_config import (
     NIFTY50_SYMBOLS,
     NIFTY50_INDEX_KEY,
     UPSTOX_INSTRUMENTS_URL,
+    FETCH_WORKERS,
+    FETCH_RETRIES,
+    INSTRUMENTS_CACHE_HOURS,
+    CACHE_DIR,
 )
 from config.swing_config import HISTORICAL_DAYS
 
+# Optional orjson parser for the instruments dump and candle responses;
+# stdlib json parses the same bytes, only slower
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Load environment variables
 load_dotenv()
 
+# Filtered NIFTY50 symbol -> instrument key map, kept between runs
+INSTRUMENTS_CACHE_PATH = os.path.join(CACHE_DIR, "nse_instruments.json")
+
+# Symbols whose instrument keys are kept from the NSE instruments dump
+_UNIVERSE = frozenset(NIFTY50_SYMBOLS)
+
+# Per-instrument daily candles, extended with only the new bars on each run
+DAILY_CACHE_DIR = os.path.join(CACHE_DIR, "daily")
+
+# Value columns of an Upstox candle row, after its timestamp
+_CANDLE_COLUMNS = ["open", "high", "low", "close", "volume", "oi"]
+
+
+def _candles_to_df(candles: List[list]) -> pd.DataFrame:
+    """
+    Convert Upstox candle rows to an OHLCV DataFrame indexed by timestamp
+
+    The numeric columns are converted in one float64 block instead of
+    per-column inference on a list of lists. Upstox returns candles newest
+    first, so the rows are normally just reversed; a full sort only happens
+    if the order is mixed.
+
+    Args:
+        candles: Rows of [timestamp, open, high, low, close, volume, oi]
+
+    Returns:
+        DataFrame with OHLCV data, oldest candle first (empty if no candles)
+    """
+    if not candles:
+        return pd.DataFrame()
+
+    rows = np.asarray(candles, dtype=object)
+    index = pd.DatetimeIndex(pd.to_datetime(rows[:, 0], format="ISO8601"), name="timestamp")
+
+    if index.is_monotonic_decreasing:
+        rows, index = rows[::-1], index[::-1]
+
+    df = pd.DataFrame(rows[:, 1:].astype(np.float64), index=index, columns=_CANDLE_COLUMNS)
+
+    if not df.index.is_monotonic_increasing:
+        df.sort_index(inplace=True)
+
+    return df
+
 
 class UpstoxDataFetcher:
     """Handles all data fetching operations from Upstox API"""
@@ -35,6 +98,19 @@ class UpstoxDataFetcher:
         self.configuration.access_token = self.access_token
         self.api_client = upstox_client.ApiClient(self.configuration)
 
+        # One keep-alive session for all REST calls, with a connection pool big
+        # enough for every fetch worker, so TCP/TLS setup is paid once per host.
+        # Rate-limit and transient server errors are retried with backoff.
+        self.session = requests.Session()
+        self.session.headers.update({"Authorization": f"Bearer {self.access_token}"})
+        retries = Retry(
+            total=FETCH_RETRIES,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+        )
+        adapter = HTTPAdapter(pool_connections=FETCH_WORKERS, pool_maxsize=FETCH_WORKERS, max_retries=retries)
+        self.session.mount("https://", adapter)
+
         # Cache for instrument keys
         self.instrument_map: Dict[str, str] = {}
 
@@ -45,28 +121,73 @@ class UpstoxDataFetcher:
         Returns:
             Dict mapping trading symbols to instrument keys
         """
+        cached = self._load_cached_instruments()
+        if cached:
+            self.instrument_map = cached
+            print(f"Loaded {len(self.instrument_map)} NIFTY50 instruments (cached)")
+            return self.instrument_map
+
         print("Fetching NSE instruments...")
-        response = requests.get(UPSTOX_INSTRUMENTS_URL, timeout=30)
+        # Public file on the assets host: don't send the API token there
+        response = self.session.get(UPSTOX_INSTRUMENTS_URL, headers={"Authorization": None}, timeout=30)
         response.raise_for_status()
 
         # Decompress gzip content
         decompressed = gzip.decompress(response.content)
-        instruments = json.loads(decompressed)
+        instruments = _json_loads(decompressed)
 
-        # Filter for NSE_EQ segment and create symbol -> instrument_key mapping
+        # Keep only NIFTY50 NSE_EQ equities; the set lookup rejects nearly every
+        # row of the dump before the segment/type checks run
         for instrument in instruments:
+            symbol = instrument.get("trading_symbol")
             if (
-                instrument.get("segment") == "NSE_EQ"
+                symbol in _UNIVERSE
+                and instrument.get("segment") == "NSE_EQ"
                 and instrument.get("instrument_type") == "EQ"
             ):
-                symbol = instrument.get("trading_symbol")
                 instrument_key = instrument.get("instrument_key")
-                if symbol and instrument_key:
+                if instrument_key:
                     self.instrument_map[symbol] = instrument_key
 
-        print(f"Loaded {len(self.instrument_map)} NSE equity instruments")
+        self._save_cached_instruments()
+
+        print(f"Loaded {len(self.instrument_map)} NIFTY50 instruments")
         return self.instrument_map
 
+    @staticmethod
+    def _load_cached_instruments() -> Optional[Dict[str, str]]:
+        """
+        Read the instrument map saved by an earlier run, if still fresh
+
+        Returns:
+            Dict mapping trading symbols to instrument keys, or None if the
+            cache is missing, older than INSTRUMENTS_CACHE_HOURS, unreadable
+            or built for a different symbol list
+        """
+        try:
+            if time.time() - os.path.getmtime(INSTRUMENTS_CACHE_PATH) > INSTRUMENTS_CACHE_HOURS * 3600:
+                return None
+            with open(INSTRUMENTS_CACHE_PATH, "r") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # The map only covers the universe it was filtered for
+        if not isinstance(cached, dict) or cached.get("symbols") != list(NIFTY50_SYMBOLS):
+            return None
+        return cached.get("instruments")
+
+    def _save_cached_instruments(self) -> None:
+        """Write the instrument map for later runs (best effort)"""
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmp_path = f"{INSTRUMENTS_CACHE_PATH}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"symbols": list(NIFTY50_SYMBOLS), "instruments": self.instrument_map}, f)
+            os.replace(tmp_path, INSTRUMENTS_CACHE_PATH)
+        except OSError:
+            pass
+
     def get_instrument_key(self, symbol: str) -> Optional[str]:
         """
         Get instrument key for a given symbol
@@ -85,6 +206,11 @@ class UpstoxDataFetcher:
         """
         Fetch historical daily candles
 
+        Candles from earlier runs are kept under DAILY_CACHE_DIR, so usually
+        only the sessions since the last run are downloaded. The full window is
+        fetched again if the cache is missing, too short for `days`, or its
+        history no longer matches the API (e.g. adjusted for a split).
+
         Args:
             instrument_key: Upstox instrument key
             days: Number of days of historical data
@@ -95,28 +221,97 @@ class UpstoxDataFetcher:
         to_date = datetime.now().strftime("%Y-%m-%d")
         from_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
 
-        url = f"https://api.upstox.com/v3/historical-candle/{instrument_key}/days/1/{to_date}/{from_date}"
-        headers = {"Authorization": f"Bearer {self.access_token}"}
+        cache_path = os.path.join(DAILY_CACHE_DIR, f"{instrument_key.replace('|', '_')}.pkl")
+        cached_from, cached = self._load_cached_daily(cache_path, from_date)
+
+        if cached is not None and len(cached) >= 2:
+            # Re-fetch from the second-last cached session: that bar was already
+            # closed when cached, so any difference means history was revised
+            overlap = cached.index[-2]
+            recent = self._fetch_daily_range(instrument_key, overlap.strftime("%Y-%m-%d"), to_date)
+
+            if overlap in recent.index and recent.at[overlap, "close"] == cached.at[overlap, "close"]:
+                # Keep the full history on disk: strategies share the cache but
+                # ask for different windows, so only the returned copy is trimmed
+                df = pd.concat([cached[cached.index < recent.index[0]], recent])
+                self._save_cached_daily(cache_path, cached_from, df)
+                return df[df.index >= pd.Timestamp(from_date, tz=df.index.tz)]
 
-        response = requests.get(url, headers=headers, timeout=30)
+        df = self._fetch_daily_range(instrument_key, from_date, to_date)
+        if not df.empty:
+            self._save_cached_daily(cache_path, from_date, df)
+
+        return df
+
+    def _fetch_daily_range(self, instrument_key: str, from_date: str, to_date: str) -> pd.DataFrame:
+        """
+        Download daily candles between two dates (inclusive)
+
+        Args:
+            instrument_key: Upstox instrument key
+            from_date: First date, YYYY-MM-DD
+            to_date: Last date, YYYY-MM-DD
+
+        Returns:
+            DataFrame with OHLCV data
+        """
+        url = f"https://api.upstox.com/v3/historical-candle/{instrument_key}/days/1/{to_date}/{from_date}"
+        response = self.session.get(url, timeout=30)
         response.raise_for_status()
 
-        data = response.json()
-        candles = data.get("data", {}).get("candles", [])
+        data = _json_loads(response.content)
+        return _candles_to_df(data.get("data", {}).get("candles", []))
 
-        if not candles:
-            return pd.DataFrame()
+    @staticmethod
+    def _load_cached_daily(path: str, from_date: str) -> Tuple[Optional[str], Optional[pd.DataFrame]]:
+        """
+        Read daily candles saved by an earlier run
 
-        # Convert to DataFrame
-        df = pd.DataFrame(
-            candles,
-            columns=["timestamp", "open", "high", "low", "close", "volume", "oi"],
-        )
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-        df.set_index("timestamp", inplace=True)
-        df.sort_index(inplace=True)
+        Args:
+            path: Pickle file written by _save_cached_daily()
+            from_date: First date the caller needs, YYYY-MM-DD
 
-        return df
+        Returns:
+            Tuple of (first cached date, cached DataFrame), or (None, None) if
+            missing, unreadable or starting after from_date
+        """
+        try:
+            with open(path, "rb") as f:
+                state = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None, None
+        except (AttributeError, ImportError, IndexError, TypeError, ValueError):
+            # Pickled by an incompatible version of the code or its libraries
+            return None, None
+
+        if not isinstance(state, dict):
+            return None, None
+
+        # ISO dates compare correctly as strings
+        cached_from = state.get("from_date")
+        candles = state.get("candles")
+        if not isinstance(cached_from, str) or cached_from > from_date or not isinstance(candles, pd.DataFrame):
+            return None, None
+        return cached_from, candles
+
+    @staticmethod
+    def _save_cached_daily(path: str, from_date: str, df: pd.DataFrame) -> None:
+        """
+        Write daily candles for later runs (best effort)
+
+        Args:
+            path: Pickle file to write
+            from_date: First date the candles cover, YYYY-MM-DD
+            df: DataFrame with OHLCV data
+        """
+        try:
+            os.makedirs(DAILY_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump({"from_date": from_date, "candles": df}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
 
     def fetch_intraday_15min(self, instrument_key: str) -> pd.DataFrame:
         """
@@ -129,27 +324,11 @@ class UpstoxDataFetcher:
             DataFrame with 15-min OHLCV data
         """
         url = f"https://api.upstox.com/v3/historical-candle/intraday/{instrument_key}/minutes/15"
-        headers = {"Authorization": f"Bearer {self.access_token}"}
-
-        response = requests.get(url, headers=headers, timeout=30)
+        response = self.session.get(url, timeout=30)
         response.raise_for_status()
 
-        data = response.json()
-        candles = data.get("data", {}).get("candles", [])
-
-        if not candles:
-            return pd.DataFrame()
-
-        # Convert to DataFrame
-        df = pd.DataFrame(
-            candles,
-            columns=["timestamp", "open", "high", "low", "close", "volume", "oi"],
-        )
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-        df.set_index("timestamp", inplace=True)
-        df.sort_index(inplace=True)
-
-        return df
+        data = _json_loads(response.content)
+        return _candles_to_df(data.get("data", {}).get("candles", []))
 
     def fetch_nifty50_index(self, days: int = HISTORICAL_DAYS) -> pd.DataFrame:
         """
@@ -181,27 +360,35 @@ class UpstoxDataFetcher:
         from_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
 
         url = f"https://api.upstox.com/v3/historical-candle/{instrument_key}/weeks/1/{to_date}/{from_date}"
-        headers = {"Authorization": f"Bearer {self.access_token}"}
-
-        response = requests.get(url, headers=headers, timeout=30)
+        response = self.session.get(url, timeout=30)
         response.raise_for_status()
 
-        data = response.json()
-        candles = data.get("data", {}).get("candles", [])
+        data = _json_loads(response.content)
+        return _candles_to_df(data.get("data", {}).get("candles", []))
 
-        if not candles:
-            return pd.DataFrame()
+    def _fetch_symbol_data(self, instrument_key: Optional[str]) -> Tuple[Optional[Dict[str, pd.DataFrame]], str]:
+        """
+        Fetch daily and intraday data for one symbol (runs on a worker thread)
 
-        # Convert to DataFrame
-        df = pd.DataFrame(
-            candles,
-            columns=["timestamp", "open", "high", "low", "close", "volume", "oi"],
-        )
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-        df.set_index("timestamp", inplace=True)
-        df.sort_index(inplace=True)
+        Args:
+            instrument_key: Upstox instrument key, or None if the symbol has none
 
-        return df
+        Returns:
+            Tuple of ({"daily": df, "intraday": df} or None on failure, status text)
+        """
+        if not instrument_key:
+            return None, "⚠️  Instrument key not found"
+
+        try:
+            daily_df = self.fetch_historical_daily(instrument_key)
+            intraday_df = self.fetch_intraday_15min(instrument_key)
+        except Exception as e:
+            return None, f"❌ Error: {str(e)}"
+
+        if daily_df.empty:
+            return None, "⚠️  No daily data"
+
+        return {"daily": daily_df, "intraday": intraday_df}, "✓"
 
     def fetch_all_nifty50_data(self) -> Dict[str, Dict[str, pd.DataFrame]]:
         """
@@ -213,36 +400,24 @@ class UpstoxDataFetcher:
         if not self.instrument_map:
             self.fetch_instruments()
 
+        # Resolve every key up front so workers get them directly
+        instrument_keys = [self.instrument_map.get(symbol) for symbol in NIFTY50_SYMBOLS]
+
         all_data = {}
         failed_symbols = []
 
         print(f"\nFetching data for {len(NIFTY50_SYMBOLS)} NIFTY50 stocks...")
 
-        for i, symbol in enumerate(NIFTY50_SYMBOLS, 1):
-            print(f"[{i}/{len(NIFTY50_SYMBOLS)}] {symbol}...", end=" ")
-
-            instrument_key = self.get_instrument_key(symbol)
-            if not instrument_key:
-                print(f"⚠️  Instrument key not found")
-                failed_symbols.append(symbol)
-                continue
+        # Requests are latency-bound, so overlap them; map() keeps symbol order
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+            fetched = pool.map(self._fetch_symbol_data, instrument_keys)
 
-            try:
-                daily_df = self.fetch_historical_daily(instrument_key)
-                intraday_df = self.fetch_intraday_15min(instrument_key)
-
-                if daily_df.empty:
-                    print("⚠️  No daily data")
+            for i, (symbol, (data, status)) in enumerate(zip(NIFTY50_SYMBOLS, fetched), 1):
+                print(f"[{i}/{len(NIFTY50_SYMBOLS)}] {symbol}... {status}")
+                if data is None:
                     failed_symbols.append(symbol)
-                    continue
-
-                all_data[symbol] = {"daily": daily_df, "intraday": intraday_df}
-                print("✓")
-
-            except Exception as e:
-                print(f"❌ Error: {str(e)}")
-                failed_symbols.append(symbol)
-                continue
+                else:
+                    all_data[symbol] = data
 
         print(f"\nSuccessfully fetched: {len(all_data)}/{len(NIFTY50_SYMBOLS)} stocks")
         if failed_symbols:
@@ -275,24 +450,8 @@ class UpstoxDataFetcher:
             raise ValueError(f"Invalid interval: {interval}. Must be one of {list(interval_map.keys())}")
 
         url = f"https://api.upstox.com/v3/historical-candle/intraday/{instrument_key}/{interval_map[interval]}"
-        headers = {"Authorization": f"Bearer {self.access_token}"}
-
-        response = requests.get(url, headers=headers, timeout=30)
+        response = self.session.get(url, timeout=30)
         response.raise_for_status()
 
-        data = response.json()
-        candles = data.get("data", {}).get("candles", [])
-
-        if not candles:
-            return pd.DataFrame()
-
-        # Convert to DataFrame
-        df = pd.DataFrame(
-            candles,
-            columns=["timestamp", "open", "high", "low", "close", "volume", "oi"],
-        )
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-        df.set_index("timestamp", inplace=True)
-        df.sort_index(inplace=True)
-
-        return df
+        data = _json_loads(response.content)
+        return _candles_to_df(data.get("data", {}).get("candles", []))
@@ -3,6 +3,15 @@
 import pandas as pd
 import numpy as np
 import pandas_ta as ta
+from typing import Tuple
+
+# Optional TA-Lib C library for EMA/RSI/ATR. pandas_ta already defers to it for
+# these when installed, so calling it directly gives the same values without
+# pandas_ta's per-call wrapper overhead.
+try:
+    import talib
+except ImportError:
+    talib = None
 
 
 def calculate_ema(df: pd.DataFrame, period: int, column: str = "close") -> pd.Series:
@@ -17,6 +26,8 @@ def calculate_ema(df: pd.DataFrame, period: int, column: str = "close") -> pd.Se
     Returns:
         Series with EMA values
     """
+    if talib is not None:
+        return pd.Series(talib.EMA(df[column].to_numpy(dtype=float), timeperiod=period), index=df.index)
     return ta.ema(df[column], length=period)
 
 
@@ -32,6 +43,8 @@ def calculate_rsi(df: pd.DataFrame, period: int = 14, column: str = "close") ->
     Returns:
         Series with RSI values
     """
+    if talib is not None:
+        return pd.Series(talib.RSI(df[column].to_numpy(dtype=float), timeperiod=period), index=df.index)
     return ta.rsi(df[column], length=period)
 
 
@@ -61,6 +74,9 @@ def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
     Returns:
         Series with ATR values
     """
+    if talib is not None:
+        high, low, close = (df[col].to_numpy(dtype=float) for col in ("high", "low", "close"))
+        return pd.Series(talib.ATR(high, low, close, timeperiod=period), index=df.index)
     return ta.atr(df["high"], df["low"], df["close"], length=period)
 
 
@@ -68,13 +84,36 @@ def calculate_vwap(df: pd.DataFrame) -> pd.Series:
     """
     Calculate Volume Weighted Average Price
 
+    Same values as ta.vwap (typical price, anchored to each trading day; equal
+    up to float rounding), but computed with one cumulative sum per session
+    instead of a groupby over daily periods. Rows must be in time order, as
+    the fetchers return them.
+
     Args:
-        df: DataFrame with OHLCV data
+        df: DataFrame with OHLCV data (DatetimeIndex)
 
     Returns:
         Series with VWAP values
     """
-    return ta.vwap(df["high"], df["low"], df["close"], df["volume"])
+    high, low, close, volume = (df[col].to_numpy(dtype=float) for col in ("high", "low", "close", "volume"))
+    typical_price = (high + low + close) / 3
+    weighted_price = typical_price * volume
+
+    cum_wp = np.empty_like(weighted_price)
+    cum_volume = np.empty_like(volume)
+
+    # Session boundaries: rows where the (local) calendar day changes
+    day = df.index.normalize().asi8
+    bounds = np.flatnonzero(day[1:] != day[:-1]) + 1
+    for start, end in zip(np.r_[0, bounds], np.r_[bounds, len(day)]):
+        np.nancumsum(weighted_price[start:end], out=cum_wp[start:end])
+        np.nancumsum(volume[start:end], out=cum_volume[start:end])
+
+    # Like pandas' cumsum, a missing value stays NaN without breaking the running total
+    cum_wp[np.isnan(weighted_price)] = np.nan
+    cum_volume[np.isnan(volume)] = np.nan
+
+    return pd.Series(cum_wp / cum_volume, index=df.index)
 
 
 def calculate_ema_slope(ema_series: pd.Series, days: int = 5) -> float:
@@ -91,10 +130,26 @@ def calculate_ema_slope(ema_series: pd.Series, days: int = 5) -> float:
     if len(ema_series) < days:
         return 0.0
 
-    recent_ema = ema_series.iloc[-days:]
-    x = np.arange(len(recent_ema))
-    slope = np.polyfit(x, recent_ema.values, 1)[0]
-    return slope
+    # Closed-form least-squares slope: with centered x the fit reduces to one
+    # dot product (same result as a degree-1 np.polyfit, no lstsq setup)
+    x = np.arange(days) - (days - 1) / 2
+    return float(ema_series.to_numpy(dtype=float)[-days:] @ (x / (x * x).sum()))
+
+
+def _mean_skipna(window: np.ndarray) -> np.ndarray:
+    """
+    Average the last axis of an array, skipping NaN like pandas .mean()
+
+    Args:
+        window: 1-D or 2-D array of values (averaged along the last axis)
+
+    Returns:
+        Mean over the valid values (NaN where there is no valid value)
+    """
+    valid = ~np.isnan(window)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(valid, window, 0.0).sum(axis=-1) / valid.sum(axis=-1)
 
 
 def calculate_volume_ratio(df: pd.DataFrame, period: int = 20) -> float:
@@ -111,8 +166,9 @@ def calculate_volume_ratio(df: pd.DataFrame, period: int = 20) -> float:
     if len(df) < period + 1:
         return 0.0
 
-    avg_volume = df["volume"].iloc[-period - 1 : -1].mean()
-    current_volume = df["volume"].iloc[-1]
+    volume = df["volume"].to_numpy()
+    avg_volume = _mean_skipna(volume[-period - 1 : -1])
+    current_volume = volume[-1]
 
     if avg_volume == 0:
         return 0.0
@@ -134,8 +190,9 @@ def calculate_atr_ratio(atr_series: pd.Series, period: int = 20) -> float:
     if len(atr_series) < period + 1:
         return 0.0
 
-    avg_atr = atr_series.iloc[-period - 1 : -1].mean()
-    current_atr = atr_series.iloc[-1]
+    atr = atr_series.to_numpy()
+    avg_atr = _mean_skipna(atr[-period - 1 : -1])
+    current_atr = atr[-1]
 
     if avg_atr == 0:
         return 0.0
@@ -143,6 +200,108 @@ def calculate_atr_ratio(atr_series: pd.Series, period: int = 20) -> float:
     return current_atr / avg_atr
 
 
+def calculate_ema_slope_batch(ema: np.ndarray, days: int = 5) -> np.ndarray:
+    """
+    Calculate EMA slope over specified days for many stocks at once
+
+    Uses the same closed-form least-squares slope as calculate_ema_slope,
+    applied to every stock with one matrix-vector product.
+
+    Args:
+        ema: 2-D array of EMA values (stocks x bars, oldest bar first)
+        days: Number of days to check slope
+
+    Returns:
+        Array with one slope per stock (positive indicates upward trend)
+    """
+    if ema.shape[1] < days:
+        return np.zeros(ema.shape[0])
+
+    # Centered x weights turn the fit into one matrix-vector product per batch
+    x = np.arange(days) - (days - 1) / 2
+    return ema[:, -days:] @ (x / (x * x).sum())
+
+
+def _ratio_to_average_batch(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Calculate current value to trailing average ratio for many stocks at once
+
+    Args:
+        values: 2-D array (stocks x bars, oldest bar first)
+        period: Number of bars before the current one to average
+
+    Returns:
+        Array of ratios (current / average), 0.0 where the average is zero
+    """
+    if values.shape[1] < period + 1:
+        return np.zeros(values.shape[0])
+
+    # Only the `period` closed bars are read, so a fresh mean costs the same as
+    # a running sum would and cannot drift when the live bar or history is revised
+    avg = _mean_skipna(values[:, -period - 1 : -1])
+    current = values[:, -1]
+
+    return np.divide(current, avg, out=np.zeros_like(current), where=avg != 0)
+
+
+def calculate_volume_ratio_batch(volume: np.ndarray, period: int = 20) -> np.ndarray:
+    """
+    Calculate current volume to average volume ratio for many stocks at once
+
+    Args:
+        volume: 2-D array of volumes (stocks x bars, oldest bar first)
+        period: Period for average volume calculation
+
+    Returns:
+        Array of volume ratios (current / average), one per stock
+    """
+    return _ratio_to_average_batch(volume, period)
+
+
+def calculate_atr_ratio_batch(atr: np.ndarray, period: int = 20) -> np.ndarray:
+    """
+    Calculate current ATR to its average ratio for many stocks at once
+
+    Args:
+        atr: 2-D array of ATR values (stocks x bars, oldest bar first)
+        period: Period for average ATR calculation
+
+    Returns:
+        Array of ATR ratios (current / average), one per stock
+    """
+    return _ratio_to_average_batch(atr, period)
+
+
+def calculate_average_volume_batch(volume: np.ndarray, period: int = 20) -> np.ndarray:
+    """
+    Calculate the average of the last `period` volumes for many stocks at once
+
+    NaN bars are skipped, like pandas .mean().
+
+    Args:
+        volume: 2-D array of volumes (stocks x bars, oldest bar first)
+        period: Number of most recent bars to average
+
+    Returns:
+        Array of average volumes, one per stock (NaN where a stock has no valid bar)
+    """
+    return _mean_skipna(volume[:, -period:])
+
+
+def calculate_period_return(close: np.ndarray, period: int = 20) -> float:
+    """
+    Calculate percentage return over a period
+
+    Args:
+        close: Array of close prices (oldest first, at least `period` values)
+        period: Period for the return calculation
+
+    Returns:
+        Percentage return from `period` bars back to the latest close
+    """
+    return ((close[-1] - close[-period]) / close[-period]) * 100
+
+
 def calculate_relative_strength(
     stock_df: pd.DataFrame, index_df: pd.DataFrame, period: int = 20
 ) -> float:
@@ -161,20 +320,99 @@ def calculate_relative_strength(
         return 0.0
 
     # Calculate percentage returns over period
-    stock_return = (
-        (stock_df["close"].iloc[-1] - stock_df["close"].iloc[-period])
-        / stock_df["close"].iloc[-period]
-    ) * 100
-
-    index_return = (
-        (index_df["close"].iloc[-1] - index_df["close"].iloc[-period])
-        / index_df["close"].iloc[-period]
-    ) * 100
+    stock_return = calculate_period_return(stock_df["close"].to_numpy(), period)
+    index_return = calculate_period_return(index_df["close"].to_numpy(), period)
 
     # Relative strength = stock return - index return
     return stock_return - index_return
 
 
+def calculate_relative_strength_batch(
+    close: np.ndarray, index_return: float, period: int = 20
+) -> np.ndarray:
+    """
+    Calculate relative strength vs index for many stocks at once
+
+    Args:
+        close: 2-D array of close prices (stocks x bars, oldest bar first)
+        index_return: Precomputed index percentage return over the same period,
+            or None if the index has too little history
+        period: Period for RS calculation
+
+    Returns:
+        Array of relative strength values, 0.0 where there is not enough data
+    """
+    if index_return is None or close.shape[1] < period:
+        return np.zeros(close.shape[0])
+
+    stock_return = ((close[:, -1] - close[:, -period]) / close[:, -period]) * 100
+
+    return stock_return - index_return
+
+
+def calculate_daily_metrics_batch(
+    close: np.ndarray,
+    ema_20: np.ndarray,
+    atr: np.ndarray,
+    volume: np.ndarray,
+    index_return: float,
+    slope_days: int = 5,
+    period: int = 20,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculate the windowed daily filter metrics for many stocks in one call
+
+    Args:
+        close: 2-D array of close prices (stocks x bars, oldest bar first)
+        ema_20: 2-D array of EMA20 values (stocks x bars)
+        atr: 2-D array of ATR values (stocks x bars)
+        volume: 2-D array of volumes (stocks x bars)
+        index_return: Precomputed index percentage return over `period`, or None
+        slope_days: Number of days for the EMA20 slope
+        period: Period for the ATR/volume averages and relative strength
+
+    Returns:
+        Tuple of (ema20_slope, atr_ratio, volume_ratio, relative_strength) arrays
+    """
+    return (
+        calculate_ema_slope_batch(ema_20, slope_days),
+        calculate_atr_ratio_batch(atr, period),
+        calculate_volume_ratio_batch(volume, period),
+        calculate_relative_strength_batch(close, index_return, period),
+    )
+
+
+def count_higher_lows(lows: np.ndarray) -> int:
+    """
+    Count consecutive higher lows from the start of a window of lows
+
+    Args:
+        lows: Array of lows (oldest first)
+
+    Returns:
+        Count of consecutive higher lows
+    """
+    # Length of the leading run of rising steps (same scan as count_higher_lows_batch)
+    rising = np.diff(lows) > 0
+    return rising.size if rising.all() else int(rising.argmin())
+
+
+def count_higher_lows_batch(lows: np.ndarray) -> np.ndarray:
+    """
+    Count consecutive higher lows for many stocks at once
+
+    Args:
+        lows: 2-D array of lows for the window (stocks x bars, oldest bar first)
+
+    Returns:
+        Array with one count of consecutive higher lows (from the window start) per stock
+    """
+    rising = np.diff(lows, axis=1) > 0
+
+    # The first falling (or NaN) step ends the run; rows with none rise throughout
+    return np.where(rising.all(axis=1), rising.shape[1], rising.argmin(axis=1))
+
+
 def check_higher_lows(df: pd.DataFrame, lookback: int = 5) -> int:
     """
     Count consecutive higher lows in recent price action
@@ -189,16 +427,46 @@ def check_higher_lows(df: pd.DataFrame, lookback: int = 5) -> int:
     if len(df) < lookback:
         return 0
 
-    recent_lows = df["low"].tail(lookback).values
-    higher_lows = 0
+    return count_higher_lows(df["low"].to_numpy()[-lookback:])
 
-    for i in range(1, len(recent_lows)):
-        if recent_lows[i] > recent_lows[i - 1]:
-            higher_lows += 1
-        else:
-            break
 
-    return higher_lows
+def is_consolidating(high: np.ndarray, low: np.ndarray, max_range_pct: float = 0.03) -> bool:
+    """
+    Check if a window of highs/lows trades in a tight range
+
+    Args:
+        high: Array of highs for the window
+        low: Array of lows for the window
+        max_range_pct: Maximum range as percentage (e.g., 0.03 = 3%)
+
+    Returns:
+        True if in consolidation
+    """
+    window_high = np.nanmax(high)
+    window_low = np.nanmin(low)
+    range_pct = (window_high - window_low) / window_low
+
+    return range_pct <= max_range_pct
+
+
+def is_consolidating_batch(high: np.ndarray, low: np.ndarray, max_range_pct: float = 0.03) -> np.ndarray:
+    """
+    Check many stocks' windows of highs/lows for a tight range at once
+
+    Args:
+        high: 2-D array of highs for the window (stocks x bars)
+        low: 2-D array of lows for the window (stocks x bars)
+        max_range_pct: Maximum range as percentage (e.g., 0.03 = 3%)
+
+    Returns:
+        Boolean array, True where the stock is in consolidation
+    """
+    # fmax/fmin skip NaN like the pandas max/min of detect_consolidation
+    window_high = np.fmax.reduce(high, axis=1)
+    window_low = np.fmin.reduce(low, axis=1)
+    range_pct = (window_high - window_low) / window_low
+
+    return range_pct <= max_range_pct
 
 
 def detect_consolidation(df: pd.DataFrame, days: int = 5, max_range_pct: float = 0.03) -> bool:
@@ -216,12 +484,23 @@ def detect_consolidation(df: pd.DataFrame, days: int = 5, max_range_pct: float =
     if len(df) < days:
         return False
 
-    recent = df.tail(days)
-    high = recent["high"].max()
-    low = recent["low"].min()
-    range_pct = (high - low) / low
+    return is_consolidating(
+        df["high"].to_numpy()[-days:], df["low"].to_numpy()[-days:], max_range_pct
+    )
 
-    return range_pct <= max_range_pct
+
+def is_volume_expanding(volume: np.ndarray) -> bool:
+    """
+    Check if each volume in a window is higher than the previous one
+
+    Args:
+        volume: Array of volumes (oldest first)
+
+    Returns:
+        True if volume is expanding
+    """
+    # Any step that is not an increase breaks the expansion (NaN steps do not)
+    return not (np.diff(volume) <= 0).any()
 
 
 def check_volume_expansion(df: pd.DataFrame, days: int = 3) -> bool:
@@ -238,94 +517,98 @@ def check_volume_expansion(df: pd.DataFrame, days: int = 3) -> bool:
     if len(df) < days:
         return False
 
-    recent_volume = df["volume"].tail(days).values
+    return is_volume_expanding(df["volume"].to_numpy()[-days:])
 
-    # Check if each day has higher volume than previous
-    for i in range(1, len(recent_volume)):
-        if recent_volume[i] <= recent_volume[i - 1]:
-            return False
 
-    return True
-
-
-def detect_bullish_engulfing(df: pd.DataFrame) -> bool:
+def is_bullish_engulfing(open_: np.ndarray, close: np.ndarray) -> bool:
     """
-    Detect bullish engulfing pattern in last 2 candles
+    Check the last 2 candles of open/close arrays for a bullish engulfing pattern
 
     Args:
-        df: DataFrame with OHLCV data
+        open_: Array of opens (oldest first, at least 2 values)
+        close: Array of closes (oldest first, at least 2 values)
 
     Returns:
         True if bullish engulfing detected
     """
-    if len(df) < 2:
-        return False
-
-    prev = df.iloc[-2]
-    curr = df.iloc[-1]
+    prev_open, curr_open = open_[-2], open_[-1]
+    prev_close, curr_close = close[-2], close[-1]
 
     # Previous candle bearish, current bullish
-    prev_bearish = prev["close"] < prev["open"]
-    curr_bullish = curr["close"] > curr["open"]
+    prev_bearish = prev_close < prev_open
+    curr_bullish = curr_close > curr_open
 
     # Current engulfs previous
-    engulfs = curr["open"] <= prev["close"] and curr["close"] >= prev["open"]
+    engulfs = curr_open <= prev_close and curr_close >= prev_open
 
     return prev_bearish and curr_bullish and engulfs
 
 
-def add_all_indicators(df: pd.DataFrame) -> pd.DataFrame:
+def detect_bullish_engulfing(df: pd.DataFrame) -> bool:
     """
-    Add all technical indicators to DataFrame
+    Detect bullish engulfing pattern in last 2 candles
 
     Args:
         df: DataFrame with OHLCV data
 
     Returns:
-        DataFrame with added indicator columns
+        True if bullish engulfing detected
     """
-    df = df.copy()
+    if len(df) < 2:
+        return False
 
-    # EMAs
-    df["ema_20"] = calculate_ema(df, 20)
-    df["ema_50"] = calculate_ema(df, 50)
-    df["ema_200"] = calculate_ema(df, 200)
+    return is_bullish_engulfing(df["open"].to_numpy(), df["close"].to_numpy())
 
-    # RSI
-    df["rsi"] = calculate_rsi(df, 14)
 
-    # ADX
-    df["adx"] = calculate_adx(df, 14)
+def add_all_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add all technical indicators to DataFrame
 
-    # ATR
-    df["atr"] = calculate_atr(df, 14)
+    Every indicator is computed from the input frame first, then the new
+    columns are attached with a single assign() (one copy of the frame
+    instead of a copy plus six column insertions).
 
-    return df
+    Args:
+        df: DataFrame with OHLCV data
+
+    Returns:
+        DataFrame with added indicator columns
+    """
+    return df.assign(
+        # EMAs
+        ema_20=calculate_ema(df, 20),
+        ema_50=calculate_ema(df, 50),
+        ema_200=calculate_ema(df, 200),
+        # RSI
+        rsi=calculate_rsi(df, 14),
+        # ADX
+        adx=calculate_adx(df, 14),
+        # ATR
+        atr=calculate_atr(df, 14),
+    )
 
 
 def add_intraday_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """
     Add intraday-specific indicators (VWAP, volume, EMAs) to 15-min DataFrame
 
+    Like add_all_indicators, the columns are attached with a single assign().
+
     Args:
         df: DataFrame with 15-min OHLCV data
 
     Returns:
         DataFrame with added intraday indicators
     """
-    df = df.copy()
-
-    # VWAP
-    df["vwap"] = calculate_vwap(df)
-
-    # 20-period volume average for intraday
-    df["volume_avg_20"] = df["volume"].rolling(window=20).mean()
-
-    # EMAs for entry levels (9 and 20 period on 15-min)
-    df["ema_9"] = calculate_ema(df, 9)
-    df["ema_20_intraday"] = calculate_ema(df, 20)
-
-    return df
+    return df.assign(
+        # VWAP
+        vwap=calculate_vwap(df),
+        # 20-period volume average for intraday
+        volume_avg_20=df["volume"].rolling(window=20).mean(),
+        # EMAs for entry levels (9 and 20 period on 15-min)
+        ema_9=calculate_ema(df, 9),
+        ema_20_intraday=calculate_ema(df, 20),
+    )
 
 
 def find_swing_low(df: pd.DataFrame, lookback: int = 10) -> float:
@@ -339,38 +622,37 @@ def find_swing_low(df: pd.DataFrame, lookback: int = 10) -> float:
     Returns:
         Swing low price
     """
-    if len(df) < lookback:
-        lookback = len(df)
+    if len(df) == 0:
+        return np.nan
 
-    recent_lows = df["low"].tail(lookback)
-    return recent_lows.min()
+    # Slicing past the start just returns every candle, like tail()
+    return np.nanmin(df["low"].to_numpy()[-lookback:])
 
 def add_scalping_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """
     Add scalping-specific indicators for ORB strategy (5-min candles)
 
+    Like add_all_indicators, the columns are attached with a single assign().
+
     Args:
         df: DataFrame with OHLCV data (5-min candles)
 
     Returns:
         DataFrame with added scalping indicator columns
     """
-    df = df.copy()
-
-    # RSI-7 for scalping (more stable than RSI-3)
-    df["rsi_7"] = ta.rsi(df["close"], length=7)
-
-    # Fast EMAs for ORB confirmation (5 and 9)
-    df["ema_5"] = calculate_ema(df, 5)
-    df["ema_9"] = calculate_ema(df, 9)
-
-    # VWAP for mean reversion
-    df["vwap"] = calculate_vwap(df)
-
-    # ATR for volatility (shorter period for scalping)
-    df["atr"] = calculate_atr(df, period=10)
-
-    # 10-period volume average (shorter for quick response)
-    df["volume_avg_10"] = df["volume"].rolling(window=10).mean()
-
-    return df
+    vwap = calculate_vwap(df)
+
+    return df.assign(
+        # RSI-7 for scalping (more stable than RSI-3)
+        rsi_7=calculate_rsi(df, period=7),
+        # Fast EMAs for ORB confirmation (5 and 9)
+        ema_5=calculate_ema(df, 5),
+        ema_9=calculate_ema(df, 9),
+        # VWAP for mean reversion, plus the distance from it the VWAP filter checks
+        vwap=vwap,
+        vwap_deviation_pct=((df["close"] - vwap) / vwap).abs() * 100,
+        # ATR for volatility (shorter period for scalping)
+        atr=calculate_atr(df, period=10),
+        # 10-period volume average (shorter for quick response)
+        volume_avg_10=df["volume"].rolling(window=10).mean(),
+    )
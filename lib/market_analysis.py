@@ -1,9 +1,143 @@
 """Market analysis module for gap analysis, support/resistance, and market sentiment"""
 
+from bisect import bisect_left
+
+import math
+
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional
-from datetime import datetime
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, Tuple, Optional
+
+# Gap / sentiment classification tables: ascending thresholds and one label per
+# band. A value strictly above thresholds[i - 1] and at or below thresholds[i]
+# gets labels[i], so bisect_left picks the band.
+_GAP_THRESHOLDS = (-2.0, -0.5, 0.5, 2.0)
+_GAP_LABELS = ("Strong Bearish", "Bearish", "Flat", "Bullish", "Strong Bullish")
+
+_SENTIMENT_THRESHOLDS = (-1.0, -0.3, 0.3, 1.0)
+_SENTIMENT_LABELS = ("Strong Bearish", "Bearish", "Neutral", "Bullish", "Strong Bullish")
+_SENTIMENT_RECOMMENDATIONS = (
+    "Avoid new longs - sit out",
+    "Reduce position sizes",
+    "Be selective",
+    "Favorable for trades",
+    "Full confidence - good day for longs",
+)
+
+# Weekly columns read by check_weekly_trend, in unpacking order
+_WEEKLY_TREND_COLUMNS = ("close", "ema_20", "ema_50", "rsi")
+
+
+def _gap_analysis(prev_close: float, today_open: float) -> Dict:
+    """
+    Classify the gap between today's open and the previous close
+
+    Args:
+        prev_close: Previous day's close
+        today_open: Today's open
+
+    Returns:
+        Dict with gap analysis
+    """
+    gap_pct = ((today_open - prev_close) / prev_close) * 100
+
+    # Classify gap (NaN falls in the lowest band, as with the old if/elif chain)
+    gap_type = _GAP_LABELS[bisect_left(_GAP_THRESHOLDS, gap_pct)]
+
+    return {
+        "gap_pct": gap_pct,
+        "gap_type": gap_type,
+        "prev_close": prev_close,
+        "today_open": today_open,
+    }
+
+
+def _swing_points(highs: np.ndarray, lows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find swing highs and lows (2-bar local extremes) in windows of highs/lows
+
+    Every 5-bar window is compared at once: the center bar is a swing high
+    (low) if it is strictly above (below) both neighbours on each side.
+
+    Args:
+        highs: Array of highs (oldest first)
+        lows: Array of lows (oldest first)
+
+    Returns:
+        Tuple of (swing_highs, swing_lows) arrays in chronological order
+    """
+    if len(highs) < 5:
+        return np.empty(0), np.empty(0)
+
+    # Find swing highs (local maximas)
+    windows = sliding_window_view(highs, 5)
+    center = windows[:, 2]
+    is_high = (
+        (center > windows[:, 0]) & (center > windows[:, 1])
+        & (center > windows[:, 3]) & (center > windows[:, 4])
+    )
+
+    # Find swing lows (local minimas)
+    windows = sliding_window_view(lows, 5)
+    center_low = windows[:, 2]
+    is_low = (
+        (center_low < windows[:, 0]) & (center_low < windows[:, 1])
+        & (center_low < windows[:, 3]) & (center_low < windows[:, 4])
+    )
+
+    return center[is_high], center_low[is_low]
+
+
+def _tail(values: np.ndarray, lookback: int) -> np.ndarray:
+    """
+    Last `lookback` entries of an array, matching DataFrame.tail
+
+    A bare values[-lookback:] would return the whole array for lookback 0.
+
+    Args:
+        values: Column array
+        lookback: Number of trailing entries to keep
+
+    Returns:
+        Array view of the trailing entries
+    """
+    return values[max(len(values) - lookback, 0):]
+
+
+def _support_resistance(swing_highs: np.ndarray, swing_lows: np.ndarray, current_price: float) -> Dict:
+    """
+    Pick the nearest swing levels above and below the current price
+
+    Args:
+        swing_highs: Array of swing highs
+        swing_lows: Array of swing lows
+        current_price: Current stock price
+
+    Returns:
+        Dict with support/resistance levels
+    """
+    # Find nearest resistance (swing high above current price)
+    resistances = swing_highs[swing_highs > current_price]
+    nearest_resistance = resistances.min() if resistances.size else None
+
+    # Find nearest support (swing low below current price)
+    supports = swing_lows[swing_lows < current_price]
+    nearest_support = supports.max() if supports.size else None
+
+    result = {}
+
+    if nearest_support:
+        support_distance = ((current_price - nearest_support) / current_price) * 100
+        result["support"] = nearest_support
+        result["support_distance_pct"] = support_distance
+
+    if nearest_resistance:
+        resistance_distance = ((nearest_resistance - current_price) / current_price) * 100
+        result["resistance"] = nearest_resistance
+        result["resistance_distance_pct"] = resistance_distance
+
+    return result
 
 
 class MarketAnalyzer:
@@ -24,35 +158,16 @@ class MarketAnalyzer:
         if daily_df.empty or len(daily_df) < 2:
             return {"gap_pct": 0, "gap_type": "unknown", "prev_close": 0}
 
-        prev_close = daily_df["close"].iloc[-2]  # Yesterday's close
+        prev_close = daily_df["close"].iat[-2]  # Yesterday's close
 
         # Get today's open from intraday data if available
         if not intraday_df.empty:
-            today_open = intraday_df["open"].iloc[0]
+            today_open = intraday_df["open"].iat[0]
         else:
             # Fallback to latest daily candle's open
-            today_open = daily_df["open"].iloc[-1]
-
-        gap_pct = ((today_open - prev_close) / prev_close) * 100
-
-        # Classify gap
-        if gap_pct > 2.0:
-            gap_type = "Strong Bullish"
-        elif gap_pct > 0.5:
-            gap_type = "Bullish"
-        elif gap_pct > -0.5:
-            gap_type = "Flat"
-        elif gap_pct > -2.0:
-            gap_type = "Bearish"
-        else:
-            gap_type = "Strong Bearish"
+            today_open = daily_df["open"].iat[-1]
 
-        return {
-            "gap_pct": gap_pct,
-            "gap_type": gap_type,
-            "prev_close": prev_close,
-            "today_open": today_open,
-        }
+        return _gap_analysis(prev_close, today_open)
 
     @staticmethod
     def get_previous_day_data(daily_df: pd.DataFrame) -> Dict:
@@ -68,13 +183,12 @@ class MarketAnalyzer:
         if daily_df.empty or len(daily_df) < 2:
             return {}
 
-        prev_day = daily_df.iloc[-2]
-
+        # Scalar reads per column; no row Series is built
         return {
-            "prev_high": prev_day["high"],
-            "prev_low": prev_day["low"],
-            "prev_close": prev_day["close"],
-            "prev_volume": prev_day["volume"],
+            "prev_high": daily_df["high"].iat[-2],
+            "prev_low": daily_df["low"].iat[-2],
+            "prev_close": daily_df["close"].iat[-2],
+            "prev_volume": daily_df["volume"].iat[-2],
         }
 
     @staticmethod
@@ -95,45 +209,65 @@ class MarketAnalyzer:
         if daily_df.empty or len(daily_df) < lookback:
             return {}
 
-        recent_data = daily_df.tail(lookback)
+        swing_highs, swing_lows = _swing_points(
+            _tail(daily_df["high"].to_numpy(), lookback), _tail(daily_df["low"].to_numpy(), lookback)
+        )
 
-        # Find swing highs (local maximas)
-        highs = recent_data["high"].values
-        swing_highs = []
-        for i in range(2, len(highs) - 2):
-            if highs[i] > highs[i - 1] and highs[i] > highs[i - 2] and \
-               highs[i] > highs[i + 1] and highs[i] > highs[i + 2]:
-                swing_highs.append(highs[i])
+        return _support_resistance(swing_highs, swing_lows, current_price)
 
-        # Find swing lows (local minimas)
-        lows = recent_data["low"].values
-        swing_lows = []
-        for i in range(2, len(lows) - 2):
-            if lows[i] < lows[i - 1] and lows[i] < lows[i - 2] and \
-               lows[i] < lows[i + 1] and lows[i] < lows[i + 2]:
-                swing_lows.append(lows[i])
+    @staticmethod
+    def analyze_symbol(
+        daily_df: pd.DataFrame, intraday_df: pd.DataFrame, lookback: int = 30
+    ) -> Dict:
+        """
+        Run gap, previous-day and support/resistance analysis for one stock
 
-        # Find nearest resistance (swing high above current price)
-        resistances = [h for h in swing_highs if h > current_price]
-        nearest_resistance = min(resistances) if resistances else None
+        Same results as calling calculate_gap, get_previous_day_data and
+        find_support_resistance (at the latest price) separately, but each
+        column is read once and shared by all three.
 
-        # Find nearest support (swing low below current price)
-        supports = [l for l in swing_lows if l < current_price]
-        nearest_support = max(supports) if supports else None
+        Args:
+            daily_df: Daily OHLCV DataFrame
+            intraday_df: Today's intraday DataFrame
+            lookback: Number of days to look back for swing points
 
-        result = {}
+        Returns:
+            Dict with "gap", "prev_day", "sr_levels" and "current_price"
+        """
+        opens = daily_df["open"].to_numpy()
+        highs = daily_df["high"].to_numpy()
+        lows = daily_df["low"].to_numpy()
+        closes = daily_df["close"].to_numpy()
 
-        if nearest_support:
-            support_distance = ((current_price - nearest_support) / current_price) * 100
-            result["support"] = nearest_support
-            result["support_distance_pct"] = support_distance
+        if intraday_df.empty:
+            today_open, current_price = opens[-1], closes[-1]
+        else:
+            today_open, current_price = intraday_df["open"].iat[0], intraday_df["close"].iat[-1]
 
-        if nearest_resistance:
-            resistance_distance = ((nearest_resistance - current_price) / current_price) * 100
-            result["resistance"] = nearest_resistance
-            result["resistance_distance_pct"] = resistance_distance
+        if len(closes) < 2:
+            gap = {"gap_pct": 0, "gap_type": "unknown", "prev_close": 0}
+            prev_day = {}
+        else:
+            gap = _gap_analysis(closes[-2], today_open)
+            prev_day = {
+                "prev_high": highs[-2],
+                "prev_low": lows[-2],
+                "prev_close": closes[-2],
+                "prev_volume": daily_df["volume"].iat[-2],
+            }
+
+        if len(closes) < lookback:
+            sr_levels = {}
+        else:
+            swing_highs, swing_lows = _swing_points(_tail(highs, lookback), _tail(lows, lookback))
+            sr_levels = _support_resistance(swing_highs, swing_lows, current_price)
 
-        return result
+        return {
+            "gap": gap,
+            "prev_day": prev_day,
+            "sr_levels": sr_levels,
+            "current_price": current_price,
+        }
 
     @staticmethod
     def check_price_location(
@@ -178,29 +312,17 @@ class MarketAnalyzer:
 
         # Get current NIFTY price
         if not nifty_intraday_df.empty:
-            current_nifty = nifty_intraday_df["close"].iloc[-1]
+            current_nifty = nifty_intraday_df["close"].iat[-1]
         else:
-            current_nifty = nifty_daily_df["close"].iloc[-1]
+            current_nifty = nifty_daily_df["close"].iat[-1]
 
         prev_close = gap_analysis.get("prev_close", current_nifty)
         day_change_pct = ((current_nifty - prev_close) / prev_close) * 100
 
         # Determine market sentiment
-        if day_change_pct > 1.0:
-            sentiment = "Strong Bullish"
-            recommendation = "Full confidence - good day for longs"
-        elif day_change_pct > 0.3:
-            sentiment = "Bullish"
-            recommendation = "Favorable for trades"
-        elif day_change_pct > -0.3:
-            sentiment = "Neutral"
-            recommendation = "Be selective"
-        elif day_change_pct > -1.0:
-            sentiment = "Bearish"
-            recommendation = "Reduce position sizes"
-        else:
-            sentiment = "Strong Bearish"
-            recommendation = "Avoid new longs - sit out"
+        band = bisect_left(_SENTIMENT_THRESHOLDS, day_change_pct)
+        sentiment = _SENTIMENT_LABELS[band]
+        recommendation = _SENTIMENT_RECOMMENDATIONS[band]
 
         return {
             "gap_pct": gap_analysis["gap_pct"],
@@ -225,17 +347,21 @@ class MarketAnalyzer:
         if weekly_df.empty or len(weekly_df) < 50:
             return {"weekly_trend": "Unknown", "reason": "Insufficient data"}
 
-        latest = weekly_df.iloc[-1]
+        # Latest bar as one float row; a missing indicator column reads as NaN
+        row = weekly_df.iloc[-1:].to_numpy(dtype=float)[0]
+        columns = weekly_df.columns
+        close, ema_20, ema_50, weekly_rsi = (
+            row[columns.get_loc(col)] if col in columns else math.nan for col in _WEEKLY_TREND_COLUMNS
+        )
 
         # Check weekly EMA alignment
-        if pd.notna(latest.get("ema_20")) and pd.notna(latest.get("ema_50")):
-            ema_aligned = latest["close"] > latest["ema_20"] > latest["ema_50"]
+        if not math.isnan(ema_20) and not math.isnan(ema_50):
+            ema_aligned = close > ema_20 > ema_50
         else:
             ema_aligned = False
 
         # Check weekly RSI
-        weekly_rsi = latest.get("rsi")
-        rsi_ok = pd.notna(weekly_rsi) and 40 < weekly_rsi < 70
+        rsi_ok = not math.isnan(weekly_rsi) and 40 < weekly_rsi < 70
 
         if ema_aligned and rsi_ok:
             trend = "Bullish"
@@ -249,7 +375,7 @@ class MarketAnalyzer:
 
         return {
             "weekly_trend": trend,
-            "weekly_rsi": weekly_rsi if pd.notna(weekly_rsi) else 0,
+            "weekly_rsi": weekly_rsi if not math.isnan(weekly_rsi) else 0,
             "ema_aligned": ema_aligned,
             "suitable_for_swing": suitable,
         }
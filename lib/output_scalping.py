@@ -1,20 +1,62 @@
 """Output handler for scalping strategy"""
 
+import gzip
+import io
 import json
+import sys
 from datetime import datetime
 from typing import List, Dict
 
+# Optional orjson encoder for the results file; stdlib json writes the same data
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_SEP60 = "=" * 60
+
+
+def _to_float(value, default=0):
+    """Convert a NumPy/Python number to a plain float for JSON (None -> default)"""
+    return float(value) if value is not None else default
+
 
 class ScalpingOutputHandler:
     """Handles console output and JSON saving for scalping strategy"""
 
+    # Per-stock report blocks, filled with one %-format call each
+    _STOCK_TEMPLATE = (
+        "\n#%d %s - Score: %.2f/100\n"
+        + "-" * 60 + "\n"
+        "  ORB Breakout:       %s\n"
+        "  ORB Range:          ₹%.2f - ₹%.2f\n"
+        "  Current Price:      ₹%.2f\n"
+        "\n  📊 TECHNICAL:\n"
+        "    EMA 5:            ₹%.2f\n"
+        "    EMA 9:            ₹%.2f\n"
+        "    VWAP:             ₹%.2f (deviation: %.2f%%)\n"
+        "    RSI-7:            %.1f\n"
+        "    ATR:              %.2f\n"
+        "    Volume Spike:     %.2fx\n"
+    )
+    _SETUP_TEMPLATE = (
+        "\n  💰 TRADE SETUP:\n"
+        "    Entry:            ₹%.2f (immediate)\n"
+        "    Stop Loss:        ₹%.2f\n"
+        "    Target:           ₹%.2f\n"
+        "    Risk:             ₹%.2f\n"
+        "    Reward:           ₹%.2f\n"
+        "    R:R Ratio:        1:%.2f\n"
+    )
+
     @staticmethod
-    def print_header():
+    def print_header(now: datetime = None):
         """Print scalping header"""
-        print("\n" + "=" * 60)
+        now = now or datetime.now()
+        print("\n" + _SEP60)
         print("NIFTY50 STOCK SELECTOR - Scalping (ORB)")
-        print(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("=" * 60 + "\n")
+        print(f"Date: {now.strftime('%Y-%m-%d %H:%M:%S')}")
+        print(_SEP60 + "\n")
 
     @staticmethod
     def print_summary(
@@ -40,52 +82,60 @@ class ScalpingOutputHandler:
             print("This is normal - ORB breakouts don't occur every day.\n")
             return
 
-        print(f"\n✅ TOP {len(stocks)} SCALPING OPPORTUNITY/OPPORTUNITIES")
-        print("=" * 60)
+        # Build the whole report first and write it once, instead of one
+        # console write per line
+        buf = io.StringIO()
+
+        print(f"\n✅ TOP {len(stocks)} SCALPING OPPORTUNITY/OPPORTUNITIES", file=buf)
+        print(_SEP60, file=buf)
 
         for i, stock in enumerate(stocks, 1):
             symbol = stock['symbol']
-            print(f"\n#{i} {symbol} - Score: {stock['final_score']:.2f}/100")
-            print("-" * 60)
-
-            # ORB details
-            print(f"  ORB Breakout:       {stock['orb_breakout'].upper()}")
-            print(f"  ORB Range:          ₹{stock['orb_low']:.2f} - ₹{stock['orb_high']:.2f}")
-            print(f"  Current Price:      ₹{stock['current_price']:.2f}")
-
-            # Technical indicators
-            print(f"\n  📊 TECHNICAL:")
-            print(f"    EMA 5:            ₹{stock['ema_5']:.2f}")
-            print(f"    EMA 9:            ₹{stock['ema_9']:.2f}")
-            print(f"    VWAP:             ₹{stock['vwap']:.2f} (deviation: {stock['vwap_deviation']:.2f}%)")
-            print(f"    RSI-7:            {stock['rsi_7']:.1f}")
-            print(f"    ATR:              {stock['atr']:.2f}")
-            print(f"    Volume Spike:     {stock['volume_spike']:.2f}x")
+
+            # ORB details and technical indicators
+            buf.write(ScalpingOutputHandler._STOCK_TEMPLATE % (
+                i, symbol, stock['final_score'],
+                stock['orb_breakout'].upper(),
+                stock['orb_low'], stock['orb_high'],
+                stock['current_price'],
+                stock['ema_5'],
+                stock['ema_9'],
+                stock['vwap'], stock['vwap_deviation'],
+                stock['rsi_7'],
+                stock['atr'],
+                stock['volume_spike'],
+            ))
 
             # Trade setup
             if trade_setups and symbol in trade_setups:
                 setup = trade_setups[symbol]
-                print(f"\n  💰 TRADE SETUP:")
-                print(f"    Entry:            ₹{setup['entry']:.2f} (immediate)")
-                print(f"    Stop Loss:        ₹{setup['stop_loss']:.2f}")
-                print(f"    Target:           ₹{setup['target']:.2f}")
-                print(f"    Risk:             ₹{setup['risk']:.2f}")
-                print(f"    Reward:           ₹{setup['reward']:.2f}")
                 rr_ratio = setup['reward'] / setup['risk'] if setup['risk'] > 0 else 0
-                print(f"    R:R Ratio:        1:{rr_ratio:.2f}")
+                buf.write(ScalpingOutputHandler._SETUP_TEMPLATE % (
+                    setup['entry'],
+                    setup['stop_loss'],
+                    setup['target'],
+                    setup['risk'],
+                    setup['reward'],
+                    rr_ratio,
+                ))
+
+        print("\n" + _SEP60, file=buf)
 
-        print("\n" + "=" * 60)
+        sys.stdout.write(buf.getvalue())
 
     @staticmethod
     def save_to_json(
         stocks: List[Dict],
         trade_setups: Dict = None,
         market_sentiment: Dict = None,
+        now: datetime = None,
     ) -> str:
-        """Save scalping results to JSON"""
+        """Save scalping results to gzip-compressed JSON"""
+        now = now or datetime.now()
+        date_str = now.strftime("%Y-%m-%d")
         output = {
-            "date": datetime.now().strftime("%Y-%m-%d"),
-            "timestamp": datetime.now().isoformat(),
+            "date": date_str,
+            "timestamp": now.isoformat(),
             "strategy": "scalping",
             "total_selected": len(stocks),
             "market_sentiment": market_sentiment or {},
@@ -95,18 +145,18 @@ class ScalpingOutputHandler:
         for stock in stocks:
             stock_data = {
                 "symbol": stock["symbol"],
-                "score": stock["final_score"],
+                "score": _to_float(stock["final_score"]),
                 "orb_breakout": stock.get("orb_breakout", ""),
-                "orb_high": stock.get("orb_high", 0),
-                "orb_low": stock.get("orb_low", 0),
-                "current_price": stock.get("current_price", 0),
-                "ema_5": stock.get("ema_5", 0),
-                "ema_9": stock.get("ema_9", 0),
-                "vwap": stock.get("vwap", 0),
-                "vwap_deviation": stock.get("vwap_deviation", 0),
-                "volume_spike": stock.get("volume_spike", 0),
-                "atr": stock.get("atr", 0),
-                "rsi_7": stock.get("rsi_7", 0),
+                "orb_high": _to_float(stock.get("orb_high")),
+                "orb_low": _to_float(stock.get("orb_low")),
+                "current_price": _to_float(stock.get("current_price")),
+                "ema_5": _to_float(stock.get("ema_5")),
+                "ema_9": _to_float(stock.get("ema_9")),
+                "vwap": _to_float(stock.get("vwap")),
+                "vwap_deviation": _to_float(stock.get("vwap_deviation")),
+                "volume_spike": _to_float(stock.get("volume_spike")),
+                "atr": _to_float(stock.get("atr")),
+                "rsi_7": _to_float(stock.get("rsi_7")),
             }
 
             # Add trade setup
@@ -116,9 +166,16 @@ class ScalpingOutputHandler:
             output["stocks"].append(stock_data)
 
         # Save to file
-        filename = f"results/{datetime.now().strftime('%Y-%m-%d')}_scalping.json"
-        with open(filename, 'w') as f:
-            json.dump(output, f, indent=2)
+        filename = f"results/{date_str}_scalping.json.gz"
+        if orjson is not None:
+            payload = orjson.dumps(
+                output, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            )
+        else:
+            payload = json.dumps(output, indent=2).encode("utf-8")
+
+        with gzip.open(filename, 'wb', compresslevel=3) as f:
+            f.write(payload)
 
         return filename
 
@@ -130,8 +187,11 @@ class ScalpingOutputHandler:
         stats: Dict = None,
     ):
         """Display and save scalping results"""
+        # One timestamp for the whole run, so the header and filename agree
+        now = datetime.now()
+
         # Print header
-        ScalpingOutputHandler.print_header()
+        ScalpingOutputHandler.print_header(now)
 
         # Print market sentiment
         if market_sentiment:
@@ -152,5 +212,5 @@ class ScalpingOutputHandler:
         ScalpingOutputHandler.print_stock_details(stocks, trade_setups)
 
         # Save to JSON
-        filename = ScalpingOutputHandler.save_to_json(stocks, trade_setups, market_sentiment)
+        filename = ScalpingOutputHandler.save_to_json(stocks, trade_setups, market_sentiment, now=now)
         print(f"\n💾 Results saved to: {filename}\n")
@@ -1,23 +1,41 @@
 """Output module for displaying and saving stock selection results"""
 
+import gzip
+import io
 import json
 import os
+import sys
 from datetime import datetime
 from typing import List, Dict
 
 from config.base_config import RESULTS_DIR
+from lib.trade_setup import TradeSetupCalculator
+
+# Optional orjson encoder for the results file; stdlib json writes the same data
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_SEP60 = "=" * 60
 
 
 class OutputHandler:
     """Handles console output and JSON file saving"""
 
     @staticmethod
-    def print_header():
-        """Print script header"""
-        print("\n" + "=" * 60)
+    def print_header(now: datetime = None):
+        """
+        Print script header
+
+        Args:
+            now: Optional run timestamp (defaults to the current time)
+        """
+        now = now or datetime.now()
+        print("\n" + _SEP60)
         print("NIFTY50 STOCK SELECTOR - Swing Trading")
-        print(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("=" * 60 + "\n")
+        print(f"Date: {now.strftime('%Y-%m-%d %H:%M:%S')}")
+        print(_SEP60 + "\n")
 
     @staticmethod
     def print_summary(
@@ -59,66 +77,72 @@ class OutputHandler:
             print("This is normal behavior - not every day has suitable setups.\n")
             return
 
-        print(f"\n✅ TOP {len(stocks)} STOCK(S) SELECTED")
-        print("=" * 60)
+        # Build the whole report first and write it once, instead of one
+        # console write per line
+        buf = io.StringIO()
+
+        print(f"\n✅ TOP {len(stocks)} STOCK(S) SELECTED", file=buf)
+        print(_SEP60, file=buf)
 
         for i, stock in enumerate(stocks, 1):
             symbol = stock['symbol']
-            print(f"\n#{i} {symbol} - Score: {stock['final_score']}/100")
-            print("-" * 60)
+            print(f"\n#{i} {symbol} - Score: {stock['final_score']}/100", file=buf)
+            print("-" * 60, file=buf)
 
             # Swing output
-            print(f"  Daily Trend:        {'✓' if stock.get('daily_trend') else '✗'}")
-            print(f"  Above 200 EMA:      {'✓' if stock.get('above_200ema') else '✗'}")
-            print(f"  ADX:                {stock.get('ADX', 0):.2f}")
-            print(f"  RSI:                {stock.get('RSI', 0):.2f}")
-            print(f"  ATR Ratio:          {stock.get('ATR_ratio', 0):.2f}x")
-            print(f"  Relative Strength:  {stock.get('relative_strength', 0):+.2f}%")
-            print(f"  Volume Confirmed:   {'✓' if stock.get('volume_confirmed') else '✗'}")
-            print(f"  Intraday Bias:      {stock.get('intraday_bias', '')}")
-            print(f"  Entry Reason:       {stock.get('entry_reason', '')}")
+            print(f"  Daily Trend:        {'✓' if stock.get('daily_trend') else '✗'}", file=buf)
+            print(f"  Above 200 EMA:      {'✓' if stock.get('above_200ema') else '✗'}", file=buf)
+            print(f"  ADX:                {stock.get('ADX', 0):.2f}", file=buf)
+            print(f"  RSI:                {stock.get('RSI', 0):.2f}", file=buf)
+            print(f"  ATR Ratio:          {stock.get('ATR_ratio', 0):.2f}x", file=buf)
+            print(f"  Relative Strength:  {stock.get('relative_strength', 0):+.2f}%", file=buf)
+            print(f"  Volume Confirmed:   {'✓' if stock.get('volume_confirmed') else '✗'}", file=buf)
+            print(f"  Intraday Bias:      {stock.get('intraday_bias', '')}", file=buf)
+            print(f"  Entry Reason:       {stock.get('entry_reason', '')}", file=buf)
 
             # Print market analysis if available
             if stock_analysis and symbol in stock_analysis:
                 analysis = stock_analysis[symbol]
-                print(f"\n  📈 MARKET CONTEXT:")
+                print(f"\n  📈 MARKET CONTEXT:", file=buf)
 
                 # Gap info
                 if "gap" in analysis and analysis["gap"]:
                     gap = analysis["gap"]
-                    print(f"    Gap: {gap['gap_pct']:+.2f}% ({gap['gap_type']})")
+                    print(f"    Gap: {gap['gap_pct']:+.2f}% ({gap['gap_type']})", file=buf)
 
                 # Previous day levels
                 if "prev_day" in analysis and analysis["prev_day"]:
                     prev = analysis["prev_day"]
-                    print(f"    Prev Day: H:₹{prev['prev_high']:.2f} L:₹{prev['prev_low']:.2f} C:₹{prev['prev_close']:.2f}")
+                    print(f"    Prev Day: H:₹{prev['prev_high']:.2f} L:₹{prev['prev_low']:.2f} C:₹{prev['prev_close']:.2f}", file=buf)
 
                 # Support/Resistance
                 if "sr_levels" in analysis and analysis["sr_levels"]:
                     sr = analysis["sr_levels"]
                     if "support" in sr:
-                        print(f"    Support: ₹{sr['support']:.2f} ({sr['support_distance_pct']:.1f}% below)")
+                        print(f"    Support: ₹{sr['support']:.2f} ({sr['support_distance_pct']:.1f}% below)", file=buf)
                     if "resistance" in sr:
-                        print(f"    Resistance: ₹{sr['resistance']:.2f} ({sr['resistance_distance_pct']:.1f}% above)")
+                        print(f"    Resistance: ₹{sr['resistance']:.2f} ({sr['resistance_distance_pct']:.1f}% above)", file=buf)
 
             # Print trade setup if available
             if trade_setups and symbol in trade_setups:
-                from lib.trade_setup import TradeSetupCalculator
                 setup_str = TradeSetupCalculator.format_trade_setup(trade_setups[symbol], symbol)
-                print(setup_str)
+                print(setup_str, file=buf)
+
+        print("\n" + _SEP60, file=buf)
 
-        print("\n" + "=" * 60)
+        sys.stdout.write(buf.getvalue())
 
     @staticmethod
-    def save_to_json(stocks: List[Dict], trade_setups: Dict = None, market_sentiment: Dict = None, stock_analysis: Dict = None) -> str:
+    def save_to_json(stocks: List[Dict], trade_setups: Dict = None, market_sentiment: Dict = None, stock_analysis: Dict = None, now: datetime = None) -> str:
         """
-        Save results to JSON file with date in filename
+        Save results to a gzip-compressed JSON file with date in filename
 
         Args:
             stocks: List of selected stocks
             trade_setups: Optional dict of trade setups by symbol
             market_sentiment: Optional market sentiment analysis
             stock_analysis: Optional dict of stock market analysis
+            now: Optional run timestamp (defaults to the current time)
 
         Returns:
             Path to saved file
@@ -127,14 +151,15 @@ class OutputHandler:
         os.makedirs(RESULTS_DIR, exist_ok=True)
 
         # Generate filename with current date
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        filename = f"{date_str}_swing.json"
+        now = now or datetime.now()
+        date_str = now.strftime("%Y-%m-%d")
+        filename = f"{date_str}_swing.json.gz"
         filepath = os.path.join(RESULTS_DIR, filename)
 
         # Prepare output data
         output_data = {
             "date": date_str,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "total_selected": len(stocks),
             "market_sentiment": market_sentiment,
             "stocks": stocks,
@@ -150,9 +175,16 @@ class OutputHandler:
                     if stock_analysis and symbol in stock_analysis:
                         stock["market_analysis"] = stock_analysis[symbol]
 
-        # Save to file
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+        # Save to file (gzip shrinks the repeated JSON keys several-fold)
+        if orjson is not None:
+            payload = orjson.dumps(
+                output_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            )
+        else:
+            payload = json.dumps(output_data, indent=2, ensure_ascii=False).encode("utf-8")
+
+        with gzip.open(filepath, "wb", compresslevel=3) as f:
+            f.write(payload)
 
         return filepath
 
@@ -178,8 +210,11 @@ class OutputHandler:
             market_sentiment: Optional market sentiment analysis
             stock_analysis: Optional dict of stock market analysis
         """
+        # One timestamp for the whole run, so the header and filename agree
+        now = datetime.now()
+
         # Print header
-        OutputHandler.print_header()
+        OutputHandler.print_header(now)
 
         # Print market sentiment
         if market_sentiment:
@@ -198,7 +233,7 @@ class OutputHandler:
 
         # Save to JSON
         try:
-            filepath = OutputHandler.save_to_json(stocks, trade_setups, market_sentiment, stock_analysis)
+            filepath = OutputHandler.save_to_json(stocks, trade_setups, market_sentiment, stock_analysis, now=now)
             print(f"\n💾 Results saved to: {filepath}\n")
         except Exception as e:
             print(f"\n⚠️  Failed to save results to JSON: {str(e)}\n")
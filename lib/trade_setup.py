@@ -30,14 +30,18 @@ class TradeSetupCalculator:
         if intraday_df.empty or len(intraday_df) < 20:
             return None
 
-        latest = intraday_df.iloc[-1]
+        # Positional scalar reads of the latest candle (no row Series)
+        columns = intraday_df.columns
 
         # Current LTP (Last Traded Price)
-        ltp = latest["close"]
+        ltp = intraday_df.iat[-1, columns.get_loc("close")]
 
         # Entry levels (EMAs for pullback)
-        ema9 = latest.get("ema_9")
-        ema20_intraday = latest.get("ema_20_intraday")
+        if "ema_9" not in columns or "ema_20_intraday" not in columns:
+            return None
+
+        ema9 = intraday_df.iat[-1, columns.get_loc("ema_9")]
+        ema20_intraday = intraday_df.iat[-1, columns.get_loc("ema_20_intraday")]
 
         if pd.isna(ema9) or pd.isna(ema20_intraday):
             return None
@@ -0,0 +1,43 @@
+"""Scoring helpers shared by the strategy scorers"""
+
+from typing import Dict, Optional, Tuple
+
+# Summary field spec: (output key, filter result key, default, round digits or None)
+SummaryField = Tuple[str, str, object, Optional[int]]
+
+
+def normalize_to_range(value: float, min_val: float, max_val: float) -> float:
+    """
+    Normalize a value to 0-100 range
+
+    Args:
+        value: Value to normalize
+        min_val: Minimum expected value
+        max_val: Maximum expected value
+
+    Returns:
+        Normalized value (0-100)
+    """
+    if max_val == min_val:
+        return 50.0
+
+    normalized = ((value - min_val) / (max_val - min_val)) * 100
+    return max(0, min(100, normalized))
+
+
+def build_summary(stock_data: Dict, fields: Tuple[SummaryField, ...]) -> Dict:
+    """
+    Build a clean output summary from a stock's filter results
+
+    Args:
+        stock_data: Full stock data with all filter results (must have "symbol")
+        fields: Summary field spec, in output order after "symbol"
+
+    Returns:
+        Summary dict with "symbol" first, then each field of the spec
+    """
+    summary = {"symbol": stock_data["symbol"]}
+    for key, source, default, digits in fields:
+        value = stock_data.get(source, default)
+        summary[key] = value if digits is None else round(value, digits)
+    return summary
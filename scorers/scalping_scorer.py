@@ -1,22 +1,86 @@
 """Scoring and ranking module for ORB scalping strategy"""
 
+import heapq
 from typing import List, Dict
-import pandas as pd
-
-from config.scalping_config import SCORING_WEIGHTS, MAX_STOCKS_TO_SELECT
+import numpy as np
+
+from config.scalping_config import SCORING_WEIGHTS, MAX_STOCKS_TO_SELECT, ORB_BREAKOUT_CODES
+from scorers._common import build_summary, normalize_to_range
+
+# Sub-score weights as fractions
+_LIQUIDITY_W, _MOMENTUM_W, _VWAP_W, _TREND_W, _VOLATILITY_W = (
+    SCORING_WEIGHTS[key] / 100
+    for key in ("liquidity", "momentum", "vwap_setup", "trend_alignment", "volatility")
+)
+
+# get_stock_summary fields: (output key, filter result key, default, round digits)
+_SUMMARY_FIELDS = (
+    ("orb_breakout", "orb_breakout", "", None),
+    ("orb_high", "orb_high", 0, 2),
+    ("orb_low", "orb_low", 0, 2),
+    ("current_price", "current_price", 0, 2),
+    ("ema_5", "ema_5", 0, 2),
+    ("ema_9", "ema_9", 0, 2),
+    ("vwap", "vwap", 0, 2),
+    ("vwap_deviation", "vwap_deviation_pct", 0, 2),
+    ("volume_spike", "volume_spike", 0, 2),
+    ("atr", "atr", 0, 2),
+    ("rsi_7", "rsi_7", 50, 2),
+    ("final_score", "final_score", 0, None),
+)
+
+# Weight of each 0-100 leaf feature in the final score, with the 60/40 mixes
+# inside the liquidity and momentum sub-scores folded in. Column order:
+# volume, spread, ORB breakout distance, volume spike, VWAP, EMA separation, ATR
+_FEATURE_WEIGHTS = np.array([
+    0.6 * _LIQUIDITY_W,
+    0.4 * _LIQUIDITY_W,
+    0.6 * _MOMENTUM_W,
+    0.4 * _MOMENTUM_W,
+    _VWAP_W,
+    _TREND_W,
+    _VOLATILITY_W,
+])
+
+
+def _normalize_array(values: np.ndarray, min_val, max_val) -> np.ndarray:
+    """
+    Array form of normalize_to_range
+
+    Args:
+        values: Values to normalize
+        min_val: Lower bound (scalar or per-stock array)
+        max_val: Upper bound (scalar or per-stock array)
+
+    Returns:
+        Array of 0-100 scores
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        normalized = ((values - min_val) / (max_val - min_val)) * 100
+
+    # max(0, min(100, x)) sends NaN to 100, so keep that here
+    normalized = np.where(np.isnan(normalized), 100.0, np.clip(normalized, 0, 100))
+    return np.where(max_val == min_val, 50.0, normalized)
+
+
+def _orb_breakout_code(filter_results: Dict) -> int:
+    """ORB breakout direction code (1 up, -1 down, 0 none), falling back to the "up"/"down" label"""
+    code = filter_results.get("orb_breakout_code")
+    if code is None:
+        code = ORB_BREAKOUT_CODES.get(filter_results.get("orb_breakout", ""), 0)
+    return code
+
+
+def _field(stocks: List[Dict], key: str, default) -> np.ndarray:
+    """Collect one numeric filter field across stocks as a float array"""
+    return np.fromiter((stock.get(key, default) for stock in stocks), dtype=float, count=len(stocks))
 
 
 class ScalpingScorer:
     """Handles scoring and ranking for ORB-based scalping"""
 
-    @staticmethod
-    def normalize_to_range(value: float, min_val: float, max_val: float) -> float:
-        """Normalize a value to 0-100 range"""
-        if max_val == min_val:
-            return 50.0
-
-        normalized = ((value - min_val) / (max_val - min_val)) * 100
-        return max(0, min(100, normalized))
+    # Shared implementation, still available as a static method
+    normalize_to_range = staticmethod(normalize_to_range)
 
     def calculate_liquidity_score(self, filter_results: Dict) -> float:
         """Calculate liquidity score (30% weight)"""
@@ -24,7 +88,7 @@ class ScalpingScorer:
 
         # Volume component (higher is better)
         avg_volume = filter_results.get("avg_volume", 0)
-        volume_score = self.normalize_to_range(avg_volume, 2e6, 50e6)
+        volume_score = normalize_to_range(avg_volume, 2e6, 50e6)
         score += volume_score * 0.6
 
         # Spread component (lower is better)
@@ -42,20 +106,20 @@ class ScalpingScorer:
         orb_high = filter_results.get("orb_high", 0)
         orb_low = filter_results.get("orb_low", 0)
         current_price = filter_results.get("current_price", 0)
-        orb_direction = filter_results.get("orb_breakout", "")
+        orb_code = _orb_breakout_code(filter_results)
 
-        if orb_direction and orb_high and orb_low:
+        if orb_code and orb_high and orb_low:
             orb_range = orb_high - orb_low
-            if orb_direction == "up":
+            if orb_code == 1:
                 breakout_dist = current_price - orb_high
-                score += self.normalize_to_range(breakout_dist, 0, orb_range * 0.5) * 0.6
-            elif orb_direction == "down":
+                score += normalize_to_range(breakout_dist, 0, orb_range * 0.5) * 0.6
+            elif orb_code == -1:
                 breakout_dist = orb_low - current_price
-                score += self.normalize_to_range(breakout_dist, 0, orb_range * 0.5) * 0.6
+                score += normalize_to_range(breakout_dist, 0, orb_range * 0.5) * 0.6
 
         # Volume spike bonus
         volume_spike = filter_results.get("volume_spike", 1.0)
-        volume_score = self.normalize_to_range(volume_spike, 1.0, 3.0)
+        volume_score = normalize_to_range(volume_spike, 1.0, 3.0)
         score += volume_score * 0.4
 
         return min(100, score)
@@ -81,7 +145,7 @@ class ScalpingScorer:
         if ema_5 and ema_9:
             # Stronger separation = stronger trend
             separation_pct = abs((ema_5 - ema_9) / ema_9) * 100
-            score = self.normalize_to_range(separation_pct, 0, 1.0)  # 0-1% separation
+            score = normalize_to_range(separation_pct, 0, 1.0)  # 0-1% separation
 
         return score
 
@@ -91,7 +155,7 @@ class ScalpingScorer:
 
         # Higher ATR = more movement potential
         # 1.5 to 10 points range
-        score = self.normalize_to_range(atr, 1.5, 10.0)
+        score = normalize_to_range(atr, 1.5, 10.0)
 
         return score
 
@@ -102,22 +166,73 @@ class ScalpingScorer:
         Returns:
             Final score (0-100)
         """
-        liquidity = self.calculate_liquidity_score(filter_results)
-        orb_breakout = self.calculate_orb_breakout_score(filter_results)
-        vwap = self.calculate_vwap_score(filter_results)
-        trend_alignment = self.calculate_trend_alignment_score(filter_results)
-        volatility = self.calculate_volatility_score(filter_results)
-
-        # Apply weights
-        final_score = (
-            liquidity * (SCORING_WEIGHTS["liquidity"] / 100) +
-            orb_breakout * (SCORING_WEIGHTS["momentum"] / 100) +
-            vwap * (SCORING_WEIGHTS["vwap_setup"] / 100) +
-            trend_alignment * (SCORING_WEIGHTS["trend_alignment"] / 100) +
-            volatility * (SCORING_WEIGHTS["volatility"] / 100)
+        # Same weighted sum as the batch path, so a stock scores identically either way
+        return float(self.calculate_final_score_batch([filter_results])[0])
+
+    @staticmethod
+    def calculate_final_score_batch(stocks: List[Dict]) -> np.ndarray:
+        """
+        Calculate weighted final scores for many stocks at once
+
+        Each filter field is read into one array, every 0-100 leaf feature of
+        the per-stock sub-score methods is computed with array operations, and
+        the final score is one product of the (N, 7) feature matrix with the
+        folded feature weights.
+
+        Args:
+            stocks: List of filter result dicts
+
+        Returns:
+            Array of final scores (0-100), one per stock
+        """
+        if not stocks:
+            return np.empty(0)
+
+        # Liquidity: volume (higher is better) and spread (lower is better)
+        volume_score = _normalize_array(_field(stocks, "avg_volume", 0), 2e6, 50e6)
+        spread_score = 100 - (_field(stocks, "spread_pct", 0.1) * 1000)
+        spread_score = np.where(spread_score > 0, spread_score, 0)
+
+        # ORB breakout distance past the broken side, plus volume spike bonus
+        orb_high = _field(stocks, "orb_high", 0)
+        orb_low = _field(stocks, "orb_low", 0)
+        current_price = _field(stocks, "current_price", 0)
+        orb_codes = np.fromiter((_orb_breakout_code(stock) for stock in stocks), dtype=np.int8, count=len(stocks))
+        up = orb_codes == 1
+        down = orb_codes == -1
+
+        breakout_dist = np.where(up, current_price - orb_high, orb_low - current_price)
+        has_breakout = (up | down) & (orb_high != 0) & (orb_low != 0)
+        breakout_score = np.where(
+            has_breakout, _normalize_array(breakout_dist, 0, (orb_high - orb_low) * 0.5), 0
+        )
+        volume_spike_score = _normalize_array(_field(stocks, "volume_spike", 1.0), 1.0, 3.0)
+
+        # VWAP proximity: 0% deviation = 100, 0.8% = 0
+        vwap = 100 - (_field(stocks, "vwap_deviation_pct", 0) / 0.8) * 100
+        vwap = np.where(vwap > 0, vwap, 0)
+
+        # EMA 5 vs 9 separation, 0-1%
+        ema_5 = _field(stocks, "ema_5", 0)
+        ema_9 = _field(stocks, "ema_9", 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            separation_pct = np.abs((ema_5 - ema_9) / ema_9) * 100
+        trend_alignment = np.where(
+            (ema_5 != 0) & (ema_9 != 0), _normalize_array(separation_pct, 0, 1.0), 0
         )
 
-        return round(final_score, 2)
+        # ATR movement potential, 1.5 to 10 points
+        volatility = _normalize_array(_field(stocks, "atr", 0), 1.5, 10.0)
+
+        # Every feature is already clamped to 0-100, so the ORB sub-score's
+        # min(100, ...) can never bind and the mixes fold into one product
+        features = np.column_stack(
+            (volume_score, spread_score, breakout_score, volume_spike_score, vwap, trend_alignment, volatility)
+        )
+        final_scores = features @ _FEATURE_WEIGHTS
+
+        # Python's round (correctly rounded), not np.round
+        return np.array([round(score, 2) for score in final_scores.tolist()])
 
     def score_and_rank(self, filtered_stocks: List[Dict]) -> List[Dict]:
         """
@@ -132,30 +247,14 @@ class ScalpingScorer:
         if not filtered_stocks:
             return []
 
-        # Calculate scores
-        for stock in filtered_stocks:
-            stock["final_score"] = self.calculate_final_score(stock)
-
-        # Sort by score (descending)
-        ranked = sorted(filtered_stocks, key=lambda x: x["final_score"], reverse=True)
+        # Calculate scores for all stocks at once
+        final_scores = self.calculate_final_score_batch(filtered_stocks)
+        for stock, final_score in zip(filtered_stocks, final_scores.tolist()):
+            stock["final_score"] = final_score
 
-        # Return top N
-        return ranked[:MAX_STOCKS_TO_SELECT]
+        # Top N by score (descending); same order as a full sort, ties keep input order
+        return heapq.nlargest(MAX_STOCKS_TO_SELECT, filtered_stocks, key=lambda x: x["final_score"])
 
     def get_stock_summary(self, stock_data: Dict) -> Dict:
         """Get clean summary for output"""
-        return {
-            "symbol": stock_data["symbol"],
-            "orb_breakout": stock_data.get("orb_breakout", ""),
-            "orb_high": round(stock_data.get("orb_high", 0), 2),
-            "orb_low": round(stock_data.get("orb_low", 0), 2),
-            "current_price": round(stock_data.get("current_price", 0), 2),
-            "ema_5": round(stock_data.get("ema_5", 0), 2),
-            "ema_9": round(stock_data.get("ema_9", 0), 2),
-            "vwap": round(stock_data.get("vwap", 0), 2),
-            "vwap_deviation": round(stock_data.get("vwap_deviation_pct", 0), 2),
-            "volume_spike": round(stock_data.get("volume_spike", 0), 2),
-            "atr": round(stock_data.get("atr", 0), 2),
-            "rsi_7": round(stock_data.get("rsi_7", 50), 2),
-            "final_score": stock_data.get("final_score", 0),
-        }
+        return build_summary(stock_data, _SUMMARY_FIELDS)
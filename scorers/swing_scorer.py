@@ -1,32 +1,46 @@
 """Scoring and ranking module for filtered stocks"""
 
+import heapq
 from typing import List, Dict
-import pandas as pd
 
 from config.swing_config import SCORING_WEIGHTS, MAX_STOCKS_TO_SELECT
+from scorers._common import build_summary, normalize_to_range
+
+# Sub-score weights (percent), in calculate_total_score's component order
+_WEIGHTS = tuple(
+    SCORING_WEIGHTS[key]
+    for key in (
+        "trend_strength",
+        "rsi_position",
+        "relative_strength",
+        "volume_expansion",
+        "atr_percentage",
+        "weekly_alignment",
+        "price_action",
+        "trade_quality",
+    )
+)
+
+# get_stock_summary fields: (output key, filter result key, default, round digits)
+_SUMMARY_FIELDS = (
+    ("daily_trend", "ema_alignment", False, None),
+    ("above_200ema", "above_200ema", False, None),
+    ("ADX", "adx", 0, 2),
+    ("RSI", "rsi", 0, 2),
+    ("ATR_ratio", "atr_ratio", 0, 2),
+    ("relative_strength", "relative_strength", 0, 2),
+    ("volume_confirmed", "volume_confirmed", False, None),
+    ("intraday_bias", "intraday_bias", "neutral", None),
+    ("final_score", "final_score", 0, None),
+    ("entry_reason", "entry_reason", "", None),
+)
 
 
 class StockScorer:
     """Handles scoring and ranking of filtered stocks"""
 
-    @staticmethod
-    def normalize_to_range(value: float, min_val: float, max_val: float) -> float:
-        """
-        Normalize a value to 0-100 range
-
-        Args:
-            value: Value to normalize
-            min_val: Minimum expected value
-            max_val: Maximum expected value
-
-        Returns:
-            Normalized value (0-100)
-        """
-        if max_val == min_val:
-            return 50.0
-
-        normalized = ((value - min_val) / (max_val - min_val)) * 100
-        return max(0, min(100, normalized))
+    # Shared implementation, still available as a static method
+    normalize_to_range = staticmethod(normalize_to_range)
 
     def calculate_trend_score(self, filter_results: Dict) -> float:
         """
@@ -43,11 +57,11 @@ class StockScorer:
         ema_slope = filter_results.get("ema20_slope", 0)
 
         # ADX component (0-100 scale, with 25 as min and 50+ as strong)
-        adx_score = self.normalize_to_range(adx, 25, 50)
+        adx_score = normalize_to_range(adx, 25, 50)
 
         # EMA slope component (higher slope = stronger trend)
         # Normalize slope (assume slope range 0 to 5 is good)
-        slope_score = self.normalize_to_range(abs(ema_slope), 0, 5)
+        slope_score = normalize_to_range(abs(ema_slope), 0, 5)
 
         # Combine: 70% ADX, 30% slope
         trend_score = (adx_score * 0.7) + (slope_score * 0.3)
@@ -73,10 +87,10 @@ class StockScorer:
             score = 100
         elif 40 <= rsi < 50:
             # Pullback zone - still good, score 60-100
-            score = self.normalize_to_range(rsi, 40, 50) * 0.4 + 60
+            score = normalize_to_range(rsi, 40, 50) * 0.4 + 60
         elif 60 < rsi <= 65:
             # Momentum zone - acceptable, score 70-100
-            score = 100 - self.normalize_to_range(rsi, 60, 65) * 0.3
+            score = 100 - normalize_to_range(rsi, 60, 65) * 0.3
         else:
             # Outside range (should have been filtered out, but just in case)
             score = 50
@@ -97,7 +111,7 @@ class StockScorer:
         rs = filter_results.get("relative_strength", 0)
 
         # Normalize RS (assume range 0 to 10% outperformance is excellent)
-        score = self.normalize_to_range(rs, 0, 10)
+        score = normalize_to_range(rs, 0, 10)
         return score
 
     def calculate_volume_score(self, filter_results: Dict) -> float:
@@ -114,7 +128,7 @@ class StockScorer:
         volume_ratio = filter_results.get("volume_ratio", 1.0)
 
         # Normalize volume ratio (1.0 to 2.5x is good range)
-        score = self.normalize_to_range(volume_ratio, 1.0, 2.5)
+        score = normalize_to_range(volume_ratio, 1.0, 2.5)
         return score
 
     def calculate_atr_score(self, filter_results: Dict) -> float:
@@ -131,7 +145,7 @@ class StockScorer:
         atr_ratio = filter_results.get("atr_ratio", 1.5)
 
         # Normalize ATR ratio (1.5 to 3.0x is good range)
-        score = self.normalize_to_range(atr_ratio, 1.5, 3.0)
+        score = normalize_to_range(atr_ratio, 1.5, 3.0)
         return score
 
     def calculate_weekly_score(self, filter_results: Dict) -> float:
@@ -168,7 +182,7 @@ class StockScorer:
 
         # Higher lows count (max 5)
         higher_lows = filter_results.get("higher_lows_count", 0)
-        score += self.normalize_to_range(higher_lows, 3, 5) * 0.4
+        score += normalize_to_range(higher_lows, 3, 5) * 0.4
 
         # Consolidation breakout bonus
         if filter_results.get("breakout_from_consolidation", False):
@@ -216,7 +230,7 @@ class StockScorer:
         # Risk-reward ratio (higher is better)
         rr = quality_metrics.get("risk_reward", 1.5)
         # Normalize 1.5R to 3.0R range
-        score += self.normalize_to_range(rr, 1.5, 3.0) * 0.5
+        score += normalize_to_range(rr, 1.5, 3.0) * 0.5
 
         return min(100, score)
 
@@ -239,17 +253,18 @@ class StockScorer:
         price_action_score = self.calculate_price_action_score(filter_results)
         trade_quality_score = self.calculate_trade_quality_score(filter_results)
 
-        # Apply weights
-        total_score = (
-            (trend_score * SCORING_WEIGHTS["trend_strength"] / 100)
-            + (rsi_score * SCORING_WEIGHTS["rsi_position"] / 100)
-            + (rs_score * SCORING_WEIGHTS["relative_strength"] / 100)
-            + (volume_score * SCORING_WEIGHTS["volume_expansion"] / 100)
-            + (atr_score * SCORING_WEIGHTS["atr_percentage"] / 100)
-            + (weekly_score * SCORING_WEIGHTS["weekly_alignment"] / 100)
-            + (price_action_score * SCORING_WEIGHTS["price_action"] / 100)
-            + (trade_quality_score * SCORING_WEIGHTS["trade_quality"] / 100)
+        # Apply weights (score * weight / 100, so totals round exactly as before)
+        components = (
+            trend_score,
+            rsi_score,
+            rs_score,
+            volume_score,
+            atr_score,
+            weekly_score,
+            price_action_score,
+            trade_quality_score,
         )
+        total_score = sum(score * weight / 100 for score, weight in zip(components, _WEIGHTS))
 
         return round(total_score, 2)
 
@@ -271,13 +286,8 @@ class StockScorer:
             stock["final_score"] = self.calculate_total_score(stock)
             stock["entry_reason"] = "trend + momentum continuation"
 
-        # Sort by score (descending)
-        ranked_stocks = sorted(
-            filtered_stocks, key=lambda x: x["final_score"], reverse=True
-        )
-
-        # Return top N stocks
-        return ranked_stocks[:MAX_STOCKS_TO_SELECT]
+        # Top N by score (descending); same order as a full sort, ties keep input order
+        return heapq.nlargest(MAX_STOCKS_TO_SELECT, filtered_stocks, key=lambda x: x["final_score"])
 
     def get_stock_summary(self, stock_data: Dict) -> Dict:
         """
@@ -289,16 +299,4 @@ class StockScorer:
         Returns:
             Clean summary dict for output
         """
-        return {
-            "symbol": stock_data["symbol"],
-            "daily_trend": stock_data.get("ema_alignment", False),
-            "above_200ema": stock_data.get("above_200ema", False),
-            "ADX": round(stock_data.get("adx", 0), 2),
-            "RSI": round(stock_data.get("rsi", 0), 2),
-            "ATR_ratio": round(stock_data.get("atr_ratio", 0), 2),
-            "relative_strength": round(stock_data.get("relative_strength", 0), 2),
-            "volume_confirmed": stock_data.get("volume_confirmed", False),
-            "intraday_bias": stock_data.get("intraday_bias", "neutral"),
-            "final_score": stock_data.get("final_score", 0),
-            "entry_reason": stock_data.get("entry_reason", ""),
-        }
+        return build_summary(stock_data, _SUMMARY_FIELDS)
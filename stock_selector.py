@@ -6,6 +6,7 @@ Supports multiple trading strategies: swing (1-3 days), scalping (intraday), etc
 
 import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 
 from strategies import StrategyFactory
@@ -54,28 +55,34 @@ def main():
             print("❌ Failed to fetch NIFTY50 index data. Exiting.")
             sys.exit(1)
 
-        nifty_index_df = add_all_indicators(nifty_index_df)
         print("✓ NIFTY50 index data loaded")
 
-        # Step 1.5: Analyze market sentiment
-        print("\nAnalyzing market sentiment...")
-        nifty_intraday = data_fetcher.fetch_intraday_15min(
-            data_fetcher.get_instrument_key("NIFTY 50") or "NSE_INDEX|Nifty 50"
-        ) if not args.test_mode else pd.DataFrame()
-        market_sentiment = MarketAnalyzer.analyze_nifty_sentiment(nifty_index_df, nifty_intraday)
-
-        print(f"NIFTY50 Sentiment: {market_sentiment['sentiment']} (Gap: {market_sentiment['gap_pct']:+.2f}%)")
-        print(f"Recommendation: {market_sentiment['recommendation']}")
-
-        # Warn if market is strongly bearish
-        if market_sentiment['day_change_pct'] < -1.0:
-            print("⚠️  WARNING: Market is down >1% - Consider reducing position sizes or sitting out")
+        # The index indicators are CPU work and nothing needs them until the
+        # strategy analysis, so compute them while the network fetches below run
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            index_indicators = pool.submit(add_all_indicators, nifty_index_df)
+
+            # Step 1.5: Analyze market sentiment (prices only, no indicators needed)
+            print("\nAnalyzing market sentiment...")
+            nifty_intraday = data_fetcher.fetch_intraday_15min(
+                data_fetcher.get_instrument_key("NIFTY 50") or "NSE_INDEX|Nifty 50"
+            ) if not args.test_mode else pd.DataFrame()
+            market_sentiment = MarketAnalyzer.analyze_nifty_sentiment(nifty_index_df, nifty_intraday)
+
+            print(f"NIFTY50 Sentiment: {market_sentiment['sentiment']} (Gap: {market_sentiment['gap_pct']:+.2f}%)")
+            print(f"Recommendation: {market_sentiment['recommendation']}")
+
+            # Warn if market is strongly bearish
+            if market_sentiment['day_change_pct'] < -1.0:
+                print("⚠️  WARNING: Market is down >1% - Consider reducing position sizes or sitting out")
+
+            # Step 2: Fetch strategy-specific data
+            all_stock_data = strategy.fetch_required_data(
+                data_fetcher,
+                strategy.config.NIFTY50_SYMBOLS
+            )
 
-        # Step 2: Fetch strategy-specific data
-        all_stock_data = strategy.fetch_required_data(
-            data_fetcher,
-            strategy.config.NIFTY50_SYMBOLS
-        )
+            nifty_index_df = index_indicators.result()
 
         if not all_stock_data:
             print("❌ No stock data fetched. Exiting.")
@@ -1,7 +1,9 @@
 """Abstract base class for all trading strategies"""
 
+import os
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 import pandas as pd
 
 
@@ -36,6 +38,34 @@ class BaseStrategy(ABC):
         """
         pass
 
+    @staticmethod
+    def add_indicators_all(
+        stock_data: Iterable[Tuple[str, Dict]],
+        add_indicators: Callable[[Dict], Dict],
+        workers: Optional[int] = 1,
+    ) -> Dict[str, Dict]:
+        """
+        Add indicators to each stock's data as it is produced
+
+        Stocks are independent, so with more than one worker each stock is
+        handed to a worker process as soon as it is yielded, and its
+        indicators are calculated while the next stock is still being fetched.
+
+        Args:
+            stock_data: Iterable of (symbol, data dict), e.g. a fetch generator
+            add_indicators: Module-level function taking and returning a data dict
+            workers: Worker processes (1 = serial, None = all cores)
+
+        Returns:
+            Dict mapping symbol to data dict with indicators, in input order
+        """
+        if workers == 1:
+            return {symbol: add_indicators(data) for symbol, data in stock_data}
+
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+            futures = {symbol: pool.submit(add_indicators, data) for symbol, data in stock_data}
+            return {symbol: future.result() for symbol, future in futures.items()}
+
     @abstractmethod
     def analyze_and_select(
         self, all_data: Dict, nifty_index_df: pd.DataFrame, nifty_intraday: pd.DataFrame, test_mode: bool = False
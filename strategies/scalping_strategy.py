@@ -1,8 +1,7 @@
 """Scalping strategy (intraday - minutes)"""
 
-import sys
 import pandas as pd
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 
 from strategies.base_strategy import BaseStrategy
 from config import scalping_config
@@ -11,6 +10,26 @@ from scorers.scalping_scorer import ScalpingScorer
 from lib.indicators import add_all_indicators, add_scalping_indicators
 
 
+def _add_scalping_indicators(data: Dict) -> Dict:
+    """
+    Add daily context and scalping indicators to one stock's data
+    (module-level so worker processes can unpickle it)
+
+    Args:
+        data: Stock data dict with "daily" and "intraday" DataFrames
+
+    Returns:
+        The same dict with indicator-enriched DataFrames
+    """
+    # Add basic indicators to daily (for context)
+    data["daily"] = add_all_indicators(data["daily"])
+
+    # Add scalping-specific indicators to 3-min data
+    data["intraday"] = add_scalping_indicators(data["intraday"])
+
+    return data
+
+
 class ScalpingStrategy(BaseStrategy):
     """Intraday scalping strategy based on 3-min candles"""
 
@@ -32,68 +51,76 @@ class ScalpingStrategy(BaseStrategy):
         Returns:
             Dictionary with stock data
         """
-        all_stock_data = {}
+        print(f"\nFetching 3-min intraday data and calculating indicators for {len(symbols)} stocks...")
 
-        print(f"\nFetching 3-min intraday data for {len(symbols)} stocks...")
+        # Indicators are added as each symbol arrives, in the same pass as the fetch
+        all_stock_data = self.add_indicators_all(
+            self._fetch_all_symbol_data(data_fetcher, symbols),
+            _add_scalping_indicators,
+            self.config.INDICATOR_WORKERS,
+        )
+
+        print(f"\nSuccessfully fetched: {len(all_stock_data)}/{len(symbols)} stocks")
+        print("✓ Indicators calculated")
+
+        return all_stock_data
+
+    def _fetch_all_symbol_data(self, data_fetcher, symbols: List[str]):
+        """
+        Fetch each symbol in turn, printing one progress line per symbol
+
+        Args:
+            data_fetcher: UpstoxDataFetcher instance
+            symbols: List of symbols (NIFTY50)
 
+        Yields:
+            (symbol, {"daily": df, "intraday": df}) for each symbol fetched successfully
+        """
         for i, symbol in enumerate(symbols, 1):
-            print(f"[{i}/{len(symbols)}] {symbol}...", end=" ")
-
-            instrument_key = data_fetcher.get_instrument_key(symbol)
-            if not instrument_key:
-                print("❌ (instrument not found)")
-                continue
-
-            try:
-                # Fetch daily data (for liquidity check and context)
-                daily_df = data_fetcher.fetch_historical_daily(
-                    instrument_key,
-                    days=self.config.HISTORICAL_DAYS
-                )
-
-                # Fetch 3-min intraday data
-                intraday_df = data_fetcher.fetch_intraday_data(
-                    instrument_key,
-                    interval=self.config.INTRADAY_INTERVAL
-                )
-
-                if daily_df.empty:
-                    print("❌ (no daily data)")
-                    continue
-
-                if intraday_df.empty:
-                    print("❌ (no intraday data)")
-                    continue
-
-                all_stock_data[symbol] = {
-                    "daily": daily_df,
-                    "intraday": intraday_df,
-                }
+            data, status = self._fetch_symbol_data(data_fetcher, symbol)
 
-                print("✓")
+            # One complete line per symbol instead of a partial line plus status
+            print(f"[{i}/{len(symbols)}] {symbol}... {status}")
+            if data is not None:
+                yield symbol, data
 
-            except Exception as e:
-                print(f"❌ ({str(e)[:30]})")
-                continue
+    def _fetch_symbol_data(self, data_fetcher, symbol: str) -> Tuple[Optional[Dict], str]:
+        """
+        Fetch daily context and scalping intraday data for one symbol
 
-        print(f"\nSuccessfully fetched: {len(all_stock_data)}/{len(symbols)} stocks")
+        Args:
+            data_fetcher: UpstoxDataFetcher instance
+            symbol: Trading symbol (e.g., 'RELIANCE')
 
-        # Add indicators
-        print("\nCalculating scalping indicators...")
-        for symbol in all_stock_data:
-            # Add basic indicators to daily (for context)
-            all_stock_data[symbol]["daily"] = add_all_indicators(
-                all_stock_data[symbol]["daily"]
+        Returns:
+            Tuple of ({"daily": df, "intraday": df} or None on failure, status text)
+        """
+        instrument_key = data_fetcher.get_instrument_key(symbol)
+        if not instrument_key:
+            return None, "❌ (instrument not found)"
+
+        try:
+            # Fetch daily data (for liquidity check and context)
+            daily_df = data_fetcher.fetch_historical_daily(
+                instrument_key,
+                days=self.config.HISTORICAL_DAYS
             )
 
-            # Add scalping-specific indicators to 3-min data
-            all_stock_data[symbol]["intraday"] = add_scalping_indicators(
-                all_stock_data[symbol]["intraday"]
+            # Fetch 3-min intraday data
+            intraday_df = data_fetcher.fetch_intraday_data(
+                instrument_key,
+                interval=self.config.INTRADAY_INTERVAL
             )
+        except Exception as e:
+            return None, f"❌ ({str(e)[:30]})"
 
-        print("✓ Indicators calculated")
+        if daily_df.empty:
+            return None, "❌ (no daily data)"
 
-        return all_stock_data
+        if intraday_df.empty:
+            return None, "❌ (no intraday data)"
+
+        return {"daily": daily_df, "intraday": intraday_df}, "✓"
 
     def analyze_and_select(
         self, all_data: Dict, nifty_index_df: pd.DataFrame, nifty_intraday: pd.DataFrame, test_mode: bool = False
@@ -117,10 +144,10 @@ class ScalpingStrategy(BaseStrategy):
         liquidity_passed = 0
         total_passed = 0
 
-        for symbol, data in all_data.items():
-            passed, results = stock_filter.filter_stock(
-                symbol, data["daily"], data["intraday"]
-            )
+        outcomes = stock_filter.filter_all(all_data)
+
+        for symbol in all_data:
+            passed, results = outcomes[symbol]
 
             # Track liquidity passes (first critical filter)
             if results.get("stage") != "liquidity":
@@ -148,12 +175,12 @@ class ScalpingStrategy(BaseStrategy):
             symbol = stock["symbol"]
             if symbol in all_data:
                 intraday_df = all_data[symbol]["intraday"]
-                latest = intraday_df.iloc[-1]
+                columns = intraday_df.columns
 
-                # Simple scalping setup
-                ltp = latest["close"]
-                vwap = latest.get("vwap", ltp)
-                atr = latest.get("atr", ltp * 0.005)  # Fallback 0.5%
+                # Simple scalping setup (positional reads of the latest candle)
+                ltp = intraday_df.iat[-1, columns.get_loc("close")]
+                vwap = intraday_df.iat[-1, columns.get_loc("vwap")] if "vwap" in columns else ltp
+                atr = intraday_df.iat[-1, columns.get_loc("atr")] if "atr" in columns else ltp * 0.005  # Fallback 0.5%
 
                 # Entry near current price (scalping is immediate)
                 stop_loss = ltp * (1 - self.config.STOP_LOSS_PCT / 100)
@@ -1,6 +1,5 @@
 """Swing trading strategy (1-3 day holds)"""
 
-import sys
 import pandas as pd
 from typing import List, Dict
 
@@ -13,6 +12,33 @@ from lib.market_analysis import MarketAnalyzer
 from lib.trade_setup import TradeSetupCalculator
 
 
+def _add_swing_indicators(data: Dict) -> Dict:
+    """
+    Add daily, intraday and weekly indicators to one stock's data
+    (module-level so worker processes can unpickle it)
+
+    Args:
+        data: Stock data dict with "daily", "intraday" and "weekly" DataFrames
+
+    Returns:
+        The same dict with indicator-enriched DataFrames
+    """
+    data["daily"] = add_all_indicators(data["daily"])
+
+    # Add intraday indicators if intraday data exists
+    if not data["intraday"].empty:
+        data["intraday"] = add_intraday_indicators(data["intraday"])
+
+    # Weekly data is optional: any failure leaves it empty
+    if not data["weekly"].empty:
+        try:
+            data["weekly"] = add_all_indicators(data["weekly"])
+        except Exception:
+            data["weekly"] = pd.DataFrame()
+
+    return data
+
+
 class SwingStrategy(BaseStrategy):
     """1-3 day swing trading strategy based on multi-timeframe analysis"""
 
@@ -40,41 +66,41 @@ class SwingStrategy(BaseStrategy):
         if not all_stock_data:
             return {}
 
-        # Fetch weekly data for all stocks
-        print("\nFetching weekly candles for trend validation...")
-        for symbol in all_stock_data:
+        # Weekly candles and indicators in one pass over the stocks
+        print("\nFetching weekly candles and calculating technical indicators...")
+        all_stock_data = self.add_indicators_all(
+            self._with_weekly_data(data_fetcher, all_stock_data),
+            _add_swing_indicators,
+            self.config.INDICATOR_WORKERS,
+        )
+
+        print("✓ Weekly data fetched and indicators calculated")
+
+        return all_stock_data
+
+    @staticmethod
+    def _with_weekly_data(data_fetcher, all_stock_data: Dict):
+        """
+        Attach raw weekly candles to each stock's data, one stock at a time
+
+        Args:
+            data_fetcher: UpstoxDataFetcher instance
+            all_stock_data: Dict mapping symbol to {"daily": df, "intraday": df}
+
+        Yields:
+            (symbol, data dict) with a "weekly" DataFrame (empty on any failure)
+        """
+        for symbol, data in all_stock_data.items():
+            weekly_df = pd.DataFrame()
             instrument_key = data_fetcher.get_instrument_key(symbol)
             if instrument_key:
                 try:
                     weekly_df = data_fetcher.fetch_weekly_candles(instrument_key, weeks=52)
-                    if not weekly_df.empty:
-                        all_stock_data[symbol]["weekly"] = add_all_indicators(weekly_df)
-                    else:
-                        all_stock_data[symbol]["weekly"] = pd.DataFrame()
                 except Exception:
-                    all_stock_data[symbol]["weekly"] = pd.DataFrame()
-            else:
-                all_stock_data[symbol]["weekly"] = pd.DataFrame()
-
-        print("✓ Weekly data fetched")
-
-        # Add indicators to all datasets
-        print("\nCalculating technical indicators...")
-        for symbol in all_stock_data:
-            # Add daily indicators
-            all_stock_data[symbol]["daily"] = add_all_indicators(
-                all_stock_data[symbol]["daily"]
-            )
+                    pass
 
-            # Add intraday indicators if intraday data exists
-            if not all_stock_data[symbol]["intraday"].empty:
-                all_stock_data[symbol]["intraday"] = add_intraday_indicators(
-                    all_stock_data[symbol]["intraday"]
-                )
-
-        print("✓ Indicators calculated")
-
-        return all_stock_data
+            data["weekly"] = weekly_df
+            yield symbol, data
 
     def analyze_and_select(
         self, all_data: Dict, nifty_index_df: pd.DataFrame, nifty_intraday: pd.DataFrame, test_mode: bool = False
@@ -103,10 +129,26 @@ class SwingStrategy(BaseStrategy):
         daily_passed_count = 0
         intraday_passed_count = 0
 
-        for symbol, data in all_data.items():
+        if test_mode:
+            # Test mode: only apply daily filters, vectorized across all stocks
+            outcomes = stock_filter.apply_daily_filters_batch(
+                {symbol: data["daily"] for symbol, data in all_data.items()}
+            )
+        else:
+            # Production mode: daily filters batched, then weekly and intraday for survivors
+            # (weekly trends unchanged since the last run are reused from disk)
+            StockFilter.load_state()
+            outcomes = stock_filter.filter_all(all_data)
+            StockFilter.save_state()
+
+        # Daily rejections per check, most frequent first, to review the check order against
+        for reason, count in stock_filter.daily_rejection_counts().items():
+            print(f"  {count:3d} rejected: {reason}")
+
+        for symbol in all_data:
+            passed, results = outcomes[symbol]
+
             if test_mode:
-                # Test mode: only apply daily filters
-                passed, results = stock_filter.apply_daily_filters(symbol, data["daily"])
                 if passed:
                     daily_passed_count += 1
                     intraday_passed_count += 1
@@ -117,11 +159,6 @@ class SwingStrategy(BaseStrategy):
                     results["weekly_suitable"] = None
                     filtered_stocks.append(results)
             else:
-                # Production mode: apply daily, weekly, and intraday filters
-                passed, results = stock_filter.filter_stock(
-                    symbol, data["daily"], data["intraday"], data.get("weekly")
-                )
-
                 if results.get("stage") == "daily" and results.get("passed"):
                     daily_passed_count += 1
 
@@ -150,20 +187,9 @@ class SwingStrategy(BaseStrategy):
                 daily_df = all_data[symbol]["daily"]
                 intraday_df = all_data[symbol]["intraday"]
 
-                # Market analysis
-                analyzer = MarketAnalyzer()
-                gap_info = analyzer.calculate_gap(daily_df, intraday_df)
-                prev_day = analyzer.get_previous_day_data(daily_df)
-
-                current_price = intraday_df["close"].iloc[-1] if not intraday_df.empty else daily_df["close"].iloc[-1]
-                sr_levels = analyzer.find_support_resistance(daily_df, current_price, lookback=30)
-
-                stock_analysis[symbol] = {
-                    "gap": gap_info,
-                    "prev_day": prev_day,
-                    "sr_levels": sr_levels,
-                    "current_price": current_price,
-                }
+                # Market analysis (gap, previous day, support/resistance in one pass)
+                stock_analysis[symbol] = MarketAnalyzer.analyze_symbol(daily_df, intraday_df, lookback=30)
+                current_price = stock_analysis[symbol]["current_price"]
 
                 # Trade setup calculation and quality validation (production mode only)
                 if not test_mode:
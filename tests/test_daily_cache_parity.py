@@ -0,0 +1,142 @@
+"""Parity tests: daily candles served from the delta cache vs a fresh full download
+
+Run from the repo root:
+    python -m unittest discover -s tests -p "*_parity.py"
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lib.data_fetcher as data_fetcher
+
+_INSTRUMENT_KEY = "NSE_EQ|TEST"
+
+
+class _FakeResponse:
+    """Just enough of requests.Response for UpstoxDataFetcher._fetch_daily_range"""
+
+    def __init__(self, candles):
+        self.content = json.dumps({"status": "success", "data": {"candles": candles}}).encode()
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class _FakeDailyApi:
+    """Serves daily candles for the requested date range from a fixed history"""
+
+    def __init__(self, sessions: int = 420):
+        self.days = pd.bdate_range(end=datetime.now().date(), periods=sessions, tz="Asia/Kolkata")
+        self.closes = 100 + np.random.default_rng(0).standard_normal(sessions).cumsum()
+        self.available = sessions  # sessions published so far
+        self.price_factor = 1.0  # < 1 simulates a split adjustment of the whole history
+        self.requests = []
+
+    def get(self, url, timeout=None):
+        to_date, from_date = url.split("/")[-2:]
+        self.requests.append(from_date)
+
+        candles = [
+            [day.isoformat(), close, close + 1, close - 1, close, 1000, 0]
+            for day, close in zip(self.days[: self.available], self.closes[: self.available] * self.price_factor)
+            if from_date <= day.strftime("%Y-%m-%d") <= to_date
+        ]
+        # Upstox returns the newest candle first
+        return _FakeResponse(candles[::-1])
+
+
+class DailyCacheParityTest(unittest.TestCase):
+    """fetch_historical_daily must return what a cold fetch would, while fetching only the delta"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        patches = [
+            mock.patch.dict(os.environ, {"UPSTOX_ACCESS_TOKEN": "test"}),
+            mock.patch.object(data_fetcher, "DAILY_CACHE_DIR", self.cache_dir),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+
+        self.api = _FakeDailyApi()
+        self.fetcher = self._fetcher(self.api)
+
+    @staticmethod
+    def _fetcher(api: _FakeDailyApi) -> data_fetcher.UpstoxDataFetcher:
+        fetcher = data_fetcher.UpstoxDataFetcher()
+        fetcher.session.get = api.get
+        return fetcher
+
+    def _cold_fetch(self, days: int) -> pd.DataFrame:
+        """Same request against an empty cache"""
+        with mock.patch.object(data_fetcher, "DAILY_CACHE_DIR", tempfile.mkdtemp()) as cold_dir:
+            try:
+                return self._fetcher(self.api).fetch_historical_daily(_INSTRUMENT_KEY, days)
+            finally:
+                shutil.rmtree(cold_dir, ignore_errors=True)
+
+    def test_delta_fetch_matches_cold_fetch(self):
+        self.api.available -= 2
+        self.fetcher.fetch_historical_daily(_INSTRUMENT_KEY, 400)
+
+        self.api.available += 2
+        self.api.requests.clear()
+        df = self.fetcher.fetch_historical_daily(_INSTRUMENT_KEY, 400)
+
+        # Only the sessions since the overlap bar were requested
+        self.assertEqual(len(self.api.requests), 1)
+        self.assertGreater(self.api.requests[0], self.api.days[-10].strftime("%Y-%m-%d"))
+        pd.testing.assert_frame_equal(df, self._cold_fetch(400))
+
+    def test_shorter_window_does_not_shrink_cache(self):
+        # Scalping (100 days) and swing (400 days) share one cache file
+        self.fetcher.fetch_historical_daily(_INSTRUMENT_KEY, 400)
+        short = self.fetcher.fetch_historical_daily(_INSTRUMENT_KEY, 100)
+        pd.testing.assert_frame_equal(short, self._cold_fetch(100))
+
+        self.api.requests.clear()
+        long = self.fetcher.fetch_historical_daily(_INSTRUMENT_KEY, 400)
+
+        self.assertEqual(len(self.api.requests), 1)
+        self.assertGreater(self.api.requests[0], self.api.days[-10].strftime("%Y-%m-%d"))
+        pd.testing.assert_frame_equal(long, self._cold_fetch(400))
+
+    def test_revised_history_triggers_full_fetch(self):
+        self.fetcher.fetch_historical_daily(_INSTRUMENT_KEY, 400)
+
+        self.api.price_factor = 0.5
+        self.api.requests.clear()
+        df = self.fetcher.fetch_historical_daily(_INSTRUMENT_KEY, 400)
+
+        # Overlap check fails, so the full window is downloaded again
+        self.assertEqual(len(self.api.requests), 2)
+        pd.testing.assert_frame_equal(df, self._cold_fetch(400))
+
+    def test_unreadable_cache_falls_back_to_full_fetch(self):
+        cache_path = os.path.join(self.cache_dir, f"{_INSTRUMENT_KEY.replace('|', '_')}.pkl")
+        for payload in (b"not a pickle", b"\x80\x04\x95\x03\x00\x00\x00\x00\x00\x00\x00]\x94."):
+            with open(cache_path, "wb") as f:
+                f.write(payload)
+
+            with self.subTest(payload=payload):
+                df = self.fetcher.fetch_historical_daily(_INSTRUMENT_KEY, 400)
+                pd.testing.assert_frame_equal(df, self._cold_fetch(400))
+
+
+if __name__ == "__main__":
+    unittest.main()
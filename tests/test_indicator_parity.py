@@ -0,0 +1,128 @@
+"""Parity tests: rewritten indicator helpers vs their plain pandas/NumPy definitions
+
+Run from the repo root:
+    python -m unittest discover -s tests -p "*_parity.py"
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.indicators import (
+    calculate_atr_ratio,
+    calculate_atr_ratio_batch,
+    calculate_ema_slope,
+    calculate_ema_slope_batch,
+    calculate_volume_ratio,
+    calculate_volume_ratio_batch,
+    calculate_vwap,
+)
+
+
+def _synthetic_intraday(seed: int, sessions: int = 3, minutes: int = 15) -> pd.DataFrame:
+    """Random-walk intraday candles over consecutive sessions (9:15-15:15 IST)"""
+    rng = np.random.default_rng(seed)
+    index = pd.DatetimeIndex(
+        np.concatenate([
+            pd.date_range(f"{day} 09:15", f"{day} 15:15", freq=f"{minutes}min", tz="Asia/Kolkata")
+            for day in pd.bdate_range(end="2026-10-15", periods=sessions).strftime("%Y-%m-%d")
+        ])
+    )
+    n = len(index)
+    close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    open_ = np.r_[1000.0, close[:-1]]
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.0008, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.0008, n)))
+    volume = rng.lognormal(11, 0.5, n).round()
+    return pd.DataFrame({"open": open_, "high": high, "low": low, "close": close, "volume": volume}, index=index)
+
+
+def _reference_vwap(df: pd.DataFrame) -> pd.Series:
+    """Typical-price VWAP anchored to each calendar day, via groupby cumulative sums"""
+    typical_price = (df["high"] + df["low"] + df["close"]) / 3
+    day = df.index.normalize()
+    return (typical_price * df["volume"]).groupby(day).cumsum() / df["volume"].groupby(day).cumsum()
+
+
+def _reference_ratio(values: pd.Series, period: int = 20) -> float:
+    """Current value over the pandas (NaN-skipping) mean of the previous `period` values"""
+    if len(values) < period + 1:
+        return 0.0
+    average = values.iloc[-period - 1 : -1].mean()
+    return 0.0 if average == 0 else values.iloc[-1] / average
+
+
+class VwapParityTest(unittest.TestCase):
+    """calculate_vwap must match the per-day groupby definition"""
+
+    def test_multi_session_frames(self):
+        for seed in range(20):
+            df = _synthetic_intraday(seed, sessions=1 + seed % 4, minutes=(5, 15)[seed % 2])
+            with self.subTest(seed=seed):
+                pd.testing.assert_series_equal(
+                    calculate_vwap(df), _reference_vwap(df), check_names=False, rtol=1e-12
+                )
+
+    def test_missing_volume_keeps_running_total(self):
+        df = _synthetic_intraday(99, sessions=2)
+        df.iloc[[3, 30], df.columns.get_loc("volume")] = np.nan
+
+        pd.testing.assert_series_equal(calculate_vwap(df), _reference_vwap(df), check_names=False, rtol=1e-12)
+
+
+class EmaSlopeParityTest(unittest.TestCase):
+    """Closed-form EMA slope must match a degree-1 np.polyfit"""
+
+    def test_scalar_and_batch_match_polyfit(self):
+        rng = np.random.default_rng(7)
+        ema = 100 + np.cumsum(rng.normal(0, 1, (50, 40)), axis=1)
+
+        for days in (2, 5, 10):
+            expected = np.array([np.polyfit(np.arange(days), row[-days:], 1)[0] for row in ema])
+            with self.subTest(days=days):
+                np.testing.assert_allclose(calculate_ema_slope_batch(ema, days), expected, rtol=1e-9, atol=1e-12)
+                scalar = [calculate_ema_slope(pd.Series(row), days) for row in ema]
+                np.testing.assert_allclose(scalar, expected, rtol=1e-9, atol=1e-12)
+
+    def test_short_series_has_zero_slope(self):
+        self.assertEqual(calculate_ema_slope(pd.Series([1.0, 2.0]), days=5), 0.0)
+        np.testing.assert_array_equal(calculate_ema_slope_batch(np.ones((3, 2)), days=5), np.zeros(3))
+
+
+class AverageRatioParityTest(unittest.TestCase):
+    """Volume/ATR ratios must match pandas' NaN-skipping mean, scalar and batch"""
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.values = rng.random((60, 30)) * 100
+        self.values[rng.random(self.values.shape) < 0.1] = np.nan
+        self.values[0, -21:-1] = np.nan  # no valid bar in the average
+        self.values[1, -21:-1] = 0.0  # zero average
+
+    def _assert_matches(self, actual: float, expected: float):
+        self.assertTrue(np.isclose(actual, expected, rtol=1e-12, equal_nan=True), f"{actual} != {expected}")
+
+    def test_volume_ratio(self):
+        batch = calculate_volume_ratio_batch(self.values)
+        for i, row in enumerate(self.values):
+            expected = _reference_ratio(pd.Series(row))
+            with self.subTest(stock=i):
+                self._assert_matches(calculate_volume_ratio(pd.DataFrame({"volume": row})), expected)
+                self._assert_matches(batch[i], expected)
+
+    def test_atr_ratio(self):
+        batch = calculate_atr_ratio_batch(self.values)
+        for i, row in enumerate(self.values):
+            expected = _reference_ratio(pd.Series(row))
+            with self.subTest(stock=i):
+                self._assert_matches(calculate_atr_ratio(pd.Series(row)), expected)
+                self._assert_matches(batch[i], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
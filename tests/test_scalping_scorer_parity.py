@@ -0,0 +1,102 @@
+"""Parity tests: batch scalping score vs the per-stock weighted sub-scores
+
+Run from the repo root:
+    python -m unittest discover -s tests -p "*_parity.py"
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.scalping_config import SCORING_WEIGHTS
+from scorers.scalping_scorer import ScalpingScorer
+
+
+def _reference_final_score(scorer: ScalpingScorer, filter_results: dict) -> float:
+    """Weighted sum of the five sub-score methods, as calculate_final_score was first written"""
+    final_score = (
+        scorer.calculate_liquidity_score(filter_results) * (SCORING_WEIGHTS["liquidity"] / 100)
+        + scorer.calculate_orb_breakout_score(filter_results) * (SCORING_WEIGHTS["momentum"] / 100)
+        + scorer.calculate_vwap_score(filter_results) * (SCORING_WEIGHTS["vwap_setup"] / 100)
+        + scorer.calculate_trend_alignment_score(filter_results) * (SCORING_WEIGHTS["trend_alignment"] / 100)
+        + scorer.calculate_volatility_score(filter_results) * (SCORING_WEIGHTS["volatility"] / 100)
+    )
+    return round(final_score, 2)
+
+
+def _synthetic_filter_results(seed: int) -> dict:
+    """Filter results shaped like ScalpingFilter output, with some fields missing or degenerate"""
+    rng = np.random.default_rng(seed)
+    orb_low = rng.uniform(100, 3000)
+    orb_high = orb_low * (1 + rng.uniform(0, 0.02))
+    direction = ("up", "down", "")[seed % 3]
+    current_price = orb_high * (1 + rng.uniform(0, 0.01)) if direction == "up" else orb_low * (1 - rng.uniform(0, 0.01))
+    ema_9 = current_price * (1 + rng.normal(0, 0.005))
+
+    results = {
+        "symbol": f"S{seed:03d}",
+        "avg_volume": rng.uniform(1e6, 60e6),
+        "spread_pct": rng.uniform(0, 0.15),
+        "orb_high": orb_high,
+        "orb_low": orb_low,
+        "current_price": current_price,
+        "orb_breakout": direction,
+        "volume_spike": rng.uniform(0.5, 4.0),
+        "vwap_deviation_pct": rng.uniform(0, 1.0),
+        "ema_5": ema_9 * (1 + rng.normal(0, 0.01)),
+        "ema_9": ema_9,
+        "atr": rng.uniform(0, 12),
+    }
+
+    # Filter output carries the direction code too; older dicts only have the label
+    if seed % 4:
+        results["orb_breakout_code"] = {"up": 1, "down": -1, "": 0}[direction]
+    if seed % 7 == 0:
+        del results["spread_pct"], results["volume_spike"]
+    if seed % 11 == 0:
+        results["ema_5"] = 0
+    if seed % 13 == 0:
+        results["orb_low"] = results["orb_high"]
+
+    return results
+
+
+class ScalpingScoreParityTest(unittest.TestCase):
+    """calculate_final_score_batch must score every stock like the sub-score methods"""
+
+    def setUp(self):
+        self.scorer = ScalpingScorer()
+        self.stocks = [_synthetic_filter_results(seed) for seed in range(500)]
+
+    def test_batch_matches_reference(self):
+        batch = self.scorer.calculate_final_score_batch(self.stocks)
+        for stock, score in zip(self.stocks, batch):
+            with self.subTest(symbol=stock["symbol"]):
+                # Folding the weights may move the unrounded sum by an ulp, so allow one rounding step
+                self.assertAlmostEqual(score, _reference_final_score(self.scorer, stock), delta=0.01 + 1e-9)
+
+    def test_scalar_matches_batch(self):
+        batch = self.scorer.calculate_final_score_batch(self.stocks)
+        for stock, score in zip(self.stocks, batch):
+            with self.subTest(symbol=stock["symbol"]):
+                self.assertEqual(self.scorer.calculate_final_score(stock), score)
+
+    def test_ranking_matches_reference_order(self):
+        ranked = self.scorer.score_and_rank([dict(stock) for stock in self.stocks])
+        expected = sorted(self.stocks, key=lambda stock: _reference_final_score(self.scorer, stock), reverse=True)
+
+        self.assertEqual(
+            [stock["symbol"] for stock in ranked], [stock["symbol"] for stock in expected[: len(ranked)]]
+        )
+
+    def test_empty_batch(self):
+        self.assertEqual(len(self.scorer.calculate_final_score_batch([])), 0)
+        self.assertEqual(self.scorer.score_and_rank([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
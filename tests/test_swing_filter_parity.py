@@ -0,0 +1,179 @@
+"""Parity tests: vectorized swing daily filters vs a per-stock pandas reference
+
+Run from the repo root:
+    python -m unittest discover -s tests -p "*_parity.py"
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.swing_config import FILTER_THRESHOLDS
+from filters.swing_filters import StockFilter
+from lib.indicators import add_all_indicators
+
+# Latest-bar columns whose NaN rejects a stock up front
+_REQUIRED = ("close", "ema_20", "ema_50", "ema_200", "adx", "rsi")
+
+# Numeric results reported for stocks that pass
+_RESULT_KEYS = ("ema20_slope", "adx", "rsi", "atr_ratio", "volume_ratio", "relative_strength")
+
+
+def _synthetic_daily(seed: int, n: int = 260) -> pd.DataFrame:
+    """Random-walk daily candles; even seeds end on a rally so some stocks pass"""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(rng.normal(0.0008, 0.0015), rng.uniform(0.008, 0.02), n)
+    close = 100 * rng.uniform(1, 30) * np.exp(np.cumsum(returns))
+    open_ = close * (1 + rng.normal(0, 0.004, n))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.006, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.006, n)))
+    volume = rng.lognormal(15, 0.4, n).round()
+
+    if seed % 2 == 0:
+        for k in (3, 2, 1):
+            close[-k] = close[-k - 1] * 1.012
+            open_[-k] = close[-k - 1] * 1.002
+            low[-k] = min(max(low[-k - 1] * 1.003, open_[-k] * 0.997), open_[-k], close[-k])
+            high[-k] = max(open_[-k], close[-k]) * 1.003
+        volume[-1] *= 1.8
+
+    index = pd.bdate_range(end="2026-10-14", periods=n, tz="Asia/Kolkata")
+    return pd.DataFrame({"open": open_, "high": high, "low": low, "close": close, "volume": volume}, index=index)
+
+
+def _reference_daily_filters(df: pd.DataFrame, nifty_df: pd.DataFrame):
+    """
+    Per-stock daily filters written directly in pandas, in the batch's check order
+
+    Returns:
+        Tuple of (passed, reason or None, numeric results or None)
+    """
+    t = FILTER_THRESHOLDS
+    if df.empty or len(df) < 200:
+        return False, "Insufficient data", None
+
+    latest = df.iloc[-1]
+    if not all(np.isfinite(latest[column]) for column in _REQUIRED):
+        return False, "NaN in required indicators", None
+
+    if latest["adx"] < t.ADX_MIN:
+        return False, f"ADX < {t.ADX_MIN}", None
+    if latest["rsi"] < t.RSI_MIN or latest["rsi"] > t.RSI_MAX:
+        return False, f"RSI not in range {t.RSI_MIN}-{t.RSI_MAX}", None
+    if latest["close"] <= latest["ema_20"] or latest["ema_20"] <= latest["ema_50"]:
+        return False, "EMA alignment failed (Close > EMA20 > EMA50)", None
+    if latest["close"] <= latest["ema_200"]:
+        return False, "Price not above 200 EMA", None
+    if latest["ema_50"] <= latest["ema_200"]:
+        return False, "Not in bullish regime (50 EMA <= 200 EMA)", None
+
+    recent_ema = df["ema_20"].iloc[-t.EMA_SLOPE_DAYS:]
+    ema20_slope = np.polyfit(np.arange(len(recent_ema)), recent_ema.to_numpy(), 1)[0]
+    if ema20_slope <= 0:
+        return False, "EMA20 slope not positive", None
+
+    # NaN ratios fall through the "<" checks, as in the original filters
+    avg_atr = df["atr"].iloc[-21:-1].mean()
+    atr_ratio = 0.0 if avg_atr == 0 else df["atr"].iloc[-1] / avg_atr
+    if atr_ratio < t.ATR_MULTIPLIER:
+        return False, f"ATR ratio < {t.ATR_MULTIPLIER}x", None
+
+    avg_volume = df["volume"].iloc[-21:-1].mean()
+    volume_ratio = 0.0 if avg_volume == 0 else df["volume"].iloc[-1] / avg_volume
+    if volume_ratio < t.VOLUME_MULTIPLIER:
+        return False, "Volume below 20-day average", None
+
+    stock_return = (df["close"].iloc[-1] - df["close"].iloc[-20]) / df["close"].iloc[-20] * 100
+    index_return = (nifty_df["close"].iloc[-1] - nifty_df["close"].iloc[-20]) / nifty_df["close"].iloc[-20] * 100
+    relative_strength = stock_return - index_return
+    if relative_strength <= 0:
+        return False, "Not outperforming NIFTY50", None
+
+    lows = df["low"].tail(t.MIN_HIGHER_LOWS + 1).to_numpy()
+    higher_lows = 0
+    for previous, current in zip(lows[:-1], lows[1:]):
+        if current <= previous:
+            break
+        higher_lows += 1
+    if higher_lows < t.MIN_HIGHER_LOWS:
+        return False, f"Less than {t.MIN_HIGHER_LOWS} consecutive higher lows", None
+
+    results = {
+        "ema20_slope": ema20_slope,
+        "adx": latest["adx"],
+        "rsi": latest["rsi"],
+        "atr_ratio": atr_ratio,
+        "volume_ratio": volume_ratio,
+        "relative_strength": relative_strength,
+    }
+    return True, None, results
+
+
+class DailyFilterParityTest(unittest.TestCase):
+    """apply_daily_filters_batch must match the reference stock by stock"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.nifty_df = add_all_indicators(_synthetic_daily(10_001))
+
+        cls.stocks = {}
+        columns = ("open", "high", "low", "volume", "atr", "close", "adx", "rsi", "ema_20")
+        for seed in range(300):
+            df = add_all_indicators(_synthetic_daily(seed))
+
+            # Every 5th stock gets a NaN, either on the latest bar or inside the 20-day averages
+            if seed % 5 == 1:
+                df.iloc[-1, df.columns.get_loc(columns[seed // 5 % len(columns)])] = np.nan
+            elif seed % 5 == 3:
+                df.iloc[-2 - seed % 20, df.columns.get_loc(("volume", "atr")[seed // 5 % 2])] = np.nan
+
+            cls.stocks[f"S{seed:03d}"] = df
+
+        # Short history is rejected before any indicator is read
+        cls.stocks["SHORT"] = add_all_indicators(_synthetic_daily(20_000, n=150))
+
+        cls.outcomes = StockFilter(cls.nifty_df).apply_daily_filters_batch(cls.stocks)
+
+    def test_pass_fail_and_reason_match_reference(self):
+        for symbol, df in self.stocks.items():
+            expected_passed, expected_reason, _ = _reference_daily_filters(df, self.nifty_df)
+            passed, results = self.outcomes[symbol]
+
+            with self.subTest(symbol=symbol):
+                self.assertEqual(passed, expected_passed)
+                self.assertEqual(results.get("reason"), expected_reason)
+
+    def test_passing_values_match_reference(self):
+        for symbol, df in self.stocks.items():
+            expected_passed, _, expected = _reference_daily_filters(df, self.nifty_df)
+            if not expected_passed:
+                continue
+
+            _, results = self.outcomes[symbol]
+            for key in _RESULT_KEYS:
+                with self.subTest(symbol=symbol, key=key):
+                    self.assertTrue(np.isclose(results[key], expected[key], rtol=1e-9, atol=1e-9, equal_nan=True))
+
+    def test_data_covers_passes_and_rejections(self):
+        # Guards the parity checks above against synthetic data that never reaches the later filters
+        reasons = {results.get("reason") for _, results in self.outcomes.values()}
+        self.assertIn(None, reasons)
+        self.assertIn("NaN in required indicators", reasons)
+        self.assertGreaterEqual(len(reasons), 6)
+
+    def test_single_stock_wrapper_matches_batch(self):
+        stock_filter = StockFilter(self.nifty_df)
+        for symbol in list(self.stocks)[:40]:
+            with self.subTest(symbol=symbol):
+                passed, results = stock_filter.apply_daily_filters(symbol, self.stocks[symbol])
+                self.assertEqual(passed, self.outcomes[symbol][0])
+                self.assertEqual(results.get("reason"), self.outcomes[symbol][1].get("reason"))
+
+
+if __name__ == "__main__":
+    unittest.main()